@@ -0,0 +1,98 @@
+# compare the 'bitparallel' matcher with the default 'difflib' matcher, and with
+# scoring every word of a plausible length, on typos of the tokens which most
+# often reach fuzzy matching: lowercase words of 4 to 14 characters
+#
+#   python benchmarks/bitparallel.py [--tokens N] [--unfiltered]
+#
+# scoring every word is very slow (over a minute for the default tokens), so
+# it is only included with --unfiltered
+import argparse
+import difflib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from check_misspellings import get_cutoff_for_token  # noqa: E402
+from check_misspellings.corpus import load_builtin_corpus  # noqa: E402
+from check_misspellings.matchers import (  # noqa: E402
+    Matcher,
+    fuzzy_candidates,
+    get_matcher,
+)
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+class UnfilteredMatcher(Matcher):
+    # the candidates which the tool scored before the matchers narrowed them
+    def __init__(self, corpus, cache_dir=None):
+        self.corpus = corpus
+
+    def candidates(self, word, cutoff):
+        return fuzzy_candidates(word, self.corpus, cutoff)
+
+
+def typo(rng, word):
+    # one deletion, insertion, substitution or transposition
+    i = rng.randrange(len(word))
+    op = rng.randrange(4)
+    if op == 0:
+        return word[:i] + word[i + 1 :]
+    if op == 1:
+        return word[:i] + rng.choice(LETTERS) + word[i:]
+    if op == 2:
+        return word[:i] + rng.choice(LETTERS) + word[i + 1 :]
+    if i == len(word) - 1:
+        i -= 1
+    return word[:i] + word[i + 1] + word[i] + word[i + 2 :]
+
+
+def benchmark(token_count, unfiltered=False):
+    rng = random.Random(1)
+    corpus = load_builtin_corpus()
+    words = [w for w in corpus if w.isalpha() and w.islower() and 4 <= len(w) <= 14]
+    tokens = [typo(rng, rng.choice(words)) for _ in range(token_count)]
+    tokens = [t for t in tokens if t not in corpus]
+
+    matchers = {
+        "difflib": get_matcher("difflib")(corpus),
+        "bitparallel": get_matcher("bitparallel")(corpus),
+    }
+    if unfiltered:
+        matchers["unfiltered"] = UnfilteredMatcher(corpus)
+    # the filters of the difflib and bitparallel matchers are built when first
+    # used, so a first pass over the tokens builds them
+    for name in ("difflib", "bitparallel"):
+        for token in tokens:
+            list(matchers[name].candidates(token, get_cutoff_for_token(token)))
+
+    results = {}
+    print(f"{len(tokens)} tokens")
+    for name, matcher in matchers.items():
+        scored = 0
+        matches = []
+        start = time.perf_counter()
+        for token in tokens:
+            cutoff = get_cutoff_for_token(token)
+            candidates = list(matcher.candidates(token, cutoff))
+            scored += len(candidates)
+            matches.append(difflib.get_close_matches(token, candidates, cutoff=cutoff))
+        elapsed = time.perf_counter() - start
+        results[name] = matches
+        print(
+            f"{name:12} {elapsed:7.2f}s  {1000 * elapsed / len(tokens):7.2f}ms/token  "
+            f"{scored / len(tokens):8.1f} words scored/token"
+        )
+    identical = all(m == results["difflib"] for m in results.values())
+    print(f"identical matches: {identical}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=300)
+    parser.add_argument("--unfiltered", action="store_true")
+    args = parser.parse_args()
+    benchmark(args.tokens, args.unfiltered)
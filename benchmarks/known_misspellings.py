@@ -0,0 +1,96 @@
+# how many fuzzy scans the table of known misspellings avoids when checking a
+# real repository, and about how long those scans would have taken
+#
+#   python benchmarks/known_misspellings.py [REPO_DIR] [CHECK_MISSPELLINGS_ARGS...]
+#
+# every file tracked by git in REPO_DIR (by default, this repository) is
+# checked with the default options, as pre-commit would check them, except for
+# the builtin table itself, whose typos would all be counted as hits
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from check_misspellings import (  # noqa: E402
+    CONTEXT,
+    get_cutoff_for_token,
+    main,
+    parse_misspellings,
+)
+from check_misspellings.corpus import load_builtin_corpus  # noqa: E402
+
+TABLE_PATH = os.path.join(
+    "check_misspellings", "builtin_corpus", "known_misspellings.py"
+)
+from check_misspellings.matchers import get_matcher  # noqa: E402
+
+
+def tracked_files(repo_dir):
+    output = subprocess.run(
+        ["git", "ls-files", "-z"],
+        cwd=repo_dir,
+        stdout=subprocess.PIPE,
+        check=True,
+    ).stdout
+    names = output.decode("utf-8").split("\0")
+    return [os.path.join(repo_dir, name) for name in names if name]
+
+
+def run(argv):
+    # run the tool, returning how long it took
+    sys.argv = ["check-misspellings"] + argv
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            main()
+        except SystemExit:
+            pass
+    return time.perf_counter() - start
+
+
+def benchmark():
+    repo_dir = os.path.abspath(sys.argv[1] if len(sys.argv) > 1 else ".")
+    extra_args = sys.argv[2:]
+    table_path = os.path.join(repo_dir, TABLE_PATH)
+    files = [
+        f for f in tracked_files(repo_dir) if os.path.isfile(f) and f != table_path
+    ]
+    elapsed = run(["-v", "--no-cache"] + extra_args + files)
+
+    # the tokens which were found in the table, rather than by fuzzy matching
+    known = parse_misspellings(CONTEXT.misspelling_files)
+    hits = sorted(
+        token
+        for token in CONTEXT.found_error_matches
+        if known.get(token) or known.get(token.lower())
+    )
+
+    print(f"files checked:              {len(files)}")
+    print(f"run time:                   {elapsed:.2f}s")
+    print(f"fuzzy scans:                {CONTEXT.fuzzy_scans}")
+    print(f"known misspellings found:   {CONTEXT.known_misspelling_hits}")
+    if not hits:
+        return
+    print(f"known misspellings:         {', '.join(hits)}")
+
+    # time the fuzzy scans which the table avoided, with the default matcher
+    # after a first pass, which builds its filters
+    matcher = get_matcher("difflib")(load_builtin_corpus())
+    for token in hits:
+        matcher.close_matches(token, get_cutoff_for_token(token))
+    start = time.perf_counter()
+    for token in hits:
+        matcher.close_matches(token, get_cutoff_for_token(token))
+    avoided = time.perf_counter() - start
+    print(
+        f"fuzzy scans avoided:        {len(hits)} "
+        f"({avoided:.2f}s, {1000 * avoided / len(hits):.1f}ms each)"
+    )
+
+
+if __name__ == "__main__":
+    benchmark()
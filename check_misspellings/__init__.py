@@ -1,12 +1,32 @@
 import argparse
-import difflib
+import os
 import re
 import sys
-import unicodedata
 
-from identify import identify
-
-from .builtin_corpus import FULL_CORPUS
+from .affixes import expand_entry
+from .builtin_corpus import CATEGORIES, categories_for_tags
+from .cache import (
+    corpus_cache_path,
+    corpus_key,
+    load_or_write_cache_file,
+    system_dict_cache_path,
+    user_cache_dir,
+    vocabulary_cache_path,
+)
+from .corpus import (
+    CORPUS_BACKEND_NAMES,
+    SYSTEM_DICT_PATH,
+    CorpusUnion,
+    WordCorpus,
+    _contains_any_case,
+    get_corpus_backend,
+    load_builtin_categories,
+    load_builtin_corpus,
+    load_frequency_tiers,
+    new_words,
+    read_system_dict,
+)
+from .matchers import MATCHER_NAMES, ScanMatcher, get_matcher
 from .tokenizers import (
     SUBTOKENIZE_TEXT_SPLIT_REGEX,
     TOKENIZER_MAPPING,
@@ -21,6 +41,11 @@ LENGTH_BASED_SIMILARITY_CUTOFFS = (
 )
 CAMEL_AND_TITLE_CASE_ITER_REGEX = re.compile(r"(^|[A-Z])[^A-Z]+")
 TRAILING_DIGIT_REGEX = re.compile(r"\d+$")
+# the name of per-directory corpus files, which add words for the files below
+# them
+OVERLAY_FILENAME = ".check-misspellings-corpus"
+# the comment which turns on 'stem/FLAGS' entries in a corpus file
+AFFIX_HEADER = "# check-misspellings: affixes"
 
 
 class _Context:
@@ -31,12 +56,34 @@ class _Context:
         self.failfast = False
         self.show_not_in_corpus = False
         self.show_all_matches = False
+        self.exhaustive_matching = False
+        self.matcher = "difflib"
+        self.cache_dir = None
+        self.corpus_backend = "sets"
+        self.system_dict = None
+        self.builtin_categories = list(CATEGORIES)
+        # names defined in the project's python files, or None if unused
+        self.project_vocabulary = None
+        self.misspelling_files = []
+        # the table of known misspellings, loaded when first needed
+        self.known_misspellings = None
+        # the tiers of common words searched before the whole corpus, loaded
+        # when first needed
+        self.frequency_tiers = None
+
+        # counts of how unknown words were matched, for verbose output
+        self.known_misspelling_hits = 0
+        self.fuzzy_scans = 0
+        self.vocabulary_hits = 0
 
         # shared caches
+        # the results of checking tokens against the corpus, which overlays
+        # keep separately (see _TokenResults)
         self.non_error_non_corpus_words = set()
         self.cached_matches_in_corpus = set()
-        # keyed by word
+        # keyed by filename, lists of (token, line, pos, lineno, matches)
         self.found_error_locations = {}
+        # keyed by word
         self.found_error_matches = {}
 
     def set_args(self, args):
@@ -46,18 +93,96 @@ class _Context:
         self.failfast = args.failfast
         self.show_not_in_corpus = args.show_not_in_corpus
         self.show_all_matches = args.show_all_matches
+        self.exhaustive_matching = args.exhaustive_matching
+        self.matcher = args.matcher
+        self.cache_dir = args.cache_dir
+        self.corpus_backend = args.corpus_backend
+        self.system_dict = args.system_dict
+        self.builtin_categories = args.builtin_categories
+        self.misspelling_files = args.misspellings
 
 
 CONTEXT = _Context()
 
 
-_SAVED_CORPUS_SLICES = {}
-
-
-def _slice_corpus_to_size(corpus, size):
-    if size not in _SAVED_CORPUS_SLICES:
-        _SAVED_CORPUS_SLICES[size] = set(x for x in corpus if len(x) == size)
-    return _SAVED_CORPUS_SLICES[size]
+class _TokenResults:
+    # the results of checking tokens against one corpus, so that each distinct
+    # token is only checked once per corpus
+    def __init__(self):
+        self.non_error_non_corpus_words = set()
+        self.cached_matches_in_corpus = set()
+        # keyed by word
+        self.found_error_matches = {}
+        # the matcher for the corpus, built when first needed
+        self.matcher = None
+        # whether the project vocabulary's verdicts apply to this corpus,
+        # which is only so for the corpus which its key describes, and not
+        # for overlays
+        self.uses_vocabulary = False
+        # whether these are the results for a corpus overlay, rather than for
+        # the base corpus, whose results are kept in the context
+        self.overlay = False
+
+
+class _LengthMap:
+    # a mapping from token lengths to slices of the corpus, where each slice
+    # holds the words which a token of that length could possibly match
+    #
+    # slices are only built when a token of that length is first looked up,
+    # and are then kept for the rest of the run
+    def __init__(self, corpus, upperbound):
+        self.upperbound = upperbound
+        # special: 0 for 'whole corpus'
+        self._slices = {0: corpus}
+        self.results = _TokenResults()
+
+    def __contains__(self, n):
+        # start at 2 -- words of length 1 will never match anything
+        return n == 0 or 2 <= n < self.upperbound
+
+    def __getitem__(self, n):
+        try:
+            return self._slices[n]
+        except KeyError:
+            pass
+        if n not in self:
+            raise KeyError(n)
+        # bound by the real_quick_ratio used in difflib
+        # if this is not above the minimum cutoff, the words cannot possibly
+        # match
+        # the bound decreases as lengths move away from `n`, so the lengths
+        # which pass it form a contiguous range and the slice can be a view
+        # of the corpus rather than a copy
+        lengths = [
+            j
+            for j in range(2, self.upperbound * 2)
+            if ((2 * min(n, j)) / (n + j)) >= 0.8
+        ]
+        self._slices[n] = self._slices[0].slice(lengths[0], lengths[-1])
+        return self._slices[n]
+
+
+class _DeferredLengthMap:
+    # a length map which is only built, by calling `build`, when it is first
+    # used
+    #
+    # runs which never look up a token (e.g. runs on excluded or unsupported
+    # files) never pay for loading the corpus
+    def __init__(self, build):
+        self._build = build
+        self._lengthmap = None
+        self.results = _TokenResults()
+
+    def _get(self):
+        if self._lengthmap is None:
+            self._lengthmap = self._build()
+        return self._lengthmap
+
+    def __contains__(self, n):
+        return n in self._get()
+
+    def __getitem__(self, n):
+        return self._get()[n]
 
 
 def lengthmapped_corpus(corpus, upperbound=15):
@@ -65,19 +190,26 @@ def lengthmapped_corpus(corpus, upperbound=15):
     # matching by only trying to match words against appropriate length words
     # the keys are the lengths of words to be matches, and the values are
     # slices of the original corpus
+    # plain collections of words (e.g. FULL_CORPUS) are grouped into a corpus
+    if not hasattr(corpus, "slice"):
+        corpus = WordCorpus.from_words(corpus)
+    return _LengthMap(corpus, upperbound)
+
+
+# length maps which were built as dicts of word sets, by older users of the
+# library, and the length maps which replace them, keyed by id
+_CONVERTED_LENGTHMAPS = {}
 
-    # special: 0 for 'whole corpus'
-    lengthmap = {0: corpus}
-    # start at 2 -- words of length 1 will never match anything
-    for i in range(2, upperbound):
-        lengthmap[i] = set()
-        for j in range(2, upperbound * 2):
-            # bound by the real_quick_ratio used in difflib
-            # if this is not above the minimum cutoff, the words cannot
-            # possibly match
-            if ((2 * min(i, j)) / (i + j)) >= 0.8:
-                lengthmap[i] = lengthmap[i] | _slice_corpus_to_size(corpus, j)
-    return lengthmap
+
+def _as_lengthmap(lengthmap):
+    if hasattr(lengthmap, "results"):
+        return lengthmap
+    key = id(lengthmap)
+    if key not in _CONVERTED_LENGTHMAPS:
+        # the original is kept with its replacement, so that its id is never
+        # reused while the replacement is
+        _CONVERTED_LENGTHMAPS[key] = (lengthmap, lengthmapped_corpus(lengthmap[0]))
+    return _CONVERTED_LENGTHMAPS[key][1]
 
 
 def corpus_for_token(token, lengthmap):
@@ -97,15 +229,11 @@ def should_skip_file(filename, tags):
     return False
 
 
-def _title(s):
-    # don't use '.title()' because on "foo's" it produces "Foo'S"
-    if not s:
-        return s
-    return s[0].upper() + s[1:]
-
-
 def _case_insensitive_str_in_corpus(s, corpus):
-    return s in corpus or s.lower() in corpus or _title(s) in corpus
+    # plain sets of words, from users of the library, are probed as they are
+    if not hasattr(corpus, "contains_any_case"):
+        return _contains_any_case(corpus, s)
+    return corpus.contains_any_case(s)
 
 
 def token_in_corpus(token, corpus, full_corpus):
@@ -185,58 +313,120 @@ def get_cutoff_for_token(tok):
     return last
 
 
+def close_matches(word, matcher, cutoff, tiers=()):
+    # the best matches for `word` found by `matcher`, with a ratio of at least
+    # `cutoff`
+    #
+    # each of `tiers` (which must be subsets of the matcher's corpus) is
+    # searched in turn before the matcher, with the reference matcher, and the
+    # search stops at the first tier with any match
+    # so, when `matcher` is exact (it finds every match, like the reference
+    # matcher), `word` has matches exactly when an exhaustive search would find
+    # some, but they can differ from those an exhaustive search would return
+    # when the corpus outside the tier has a closer match than the tier
+    # approximate matchers (e.g. 'symspell', or any matcher over the 'sqlite'
+    # backend) can miss matches which a tier finds, so with them a word can
+    # have matches here which an exhaustive search would not find
+    for tier in tiers:
+        matches = ScanMatcher(tier).close_matches(word, cutoff)
+        if matches:
+            return matches
+    return matcher.close_matches(word, cutoff)
+
+
 def check_tokenstream(filename, tokenizer, context, lengthmap):
-    full_corpus = lengthmap[0]
+    lengthmap = _as_lengthmap(lengthmap)
+    results = lengthmap.results
+    if not results.overlay:
+        # callers of earlier versions find the results for the base corpus in
+        # the context
+        results.non_error_non_corpus_words = context.non_error_non_corpus_words
+        results.cached_matches_in_corpus = context.cached_matches_in_corpus
+    vocabulary = context.project_vocabulary if results.uses_vocabulary else None
+    project_names = vocabulary.names_of(filename) if vocabulary else frozenset()
     for token, line, lineno, pos in tokenizer(filename, context):
         location_item = (token, line.rstrip("\n"), pos, lineno)
 
-        current_corpus = corpus_for_token(token, lengthmap)
-        if token in context.non_error_non_corpus_words:
+        if token in results.non_error_non_corpus_words:
             continue
-        if token in context.cached_matches_in_corpus:
+        if token in results.cached_matches_in_corpus:
             continue
-        if token in context.found_error_matches:
+        if token in results.found_error_matches:
             if filename not in context.found_error_locations:
                 context.found_error_locations[filename] = []
-            context.found_error_locations[filename].append(location_item)
+            context.found_error_locations[filename].append(
+                location_item + (results.found_error_matches[token],)
+            )
             continue
 
         # token in corpus is the last check because it is the most expensive
         # it will lowercase, split, title-ize, etc
+        # it is also the first point at which the corpus is needed
+        full_corpus = lengthmap[0]
+        current_corpus = corpus_for_token(token, lengthmap)
         if token_in_corpus(token, current_corpus, full_corpus):
-            context.cached_matches_in_corpus.add(token)
+            results.cached_matches_in_corpus.add(token)
             continue
 
         if context.show_not_in_corpus:
             print(f"non-corpus word: {token}")
 
+        # names which this file defines, and which had no close match in an
+        # earlier run, are not matched again
+        if token in project_names and vocabulary.had_no_match(token):
+            context.vocabulary_hits += 1
+            results.non_error_non_corpus_words.add(token)
+            continue
+
+        # common misspellings are looked up before any fuzzy matching, which
+        # is by far the most expensive step
+        if context.known_misspellings is None:
+            context.known_misspellings = parse_misspellings(context.misspelling_files)
+        known = context.known_misspellings
+        matches = known.get(token) or known.get(token.lower())
+        if matches:
+            context.known_misspelling_hits += 1
+        else:
+            context.fuzzy_scans += 1
+            # only the best match is shown unless all matches are requested,
+            # so the search can stop at the first tier of common words which
+            # has one
+            tiers = ()
+            if not (context.exhaustive_matching or context.show_all_matches):
+                if context.frequency_tiers is None:
+                    context.frequency_tiers = load_frequency_tiers()
+                tiers = context.frequency_tiers
+            if results.matcher is None:
+                results.matcher = get_matcher(context.matcher)(
+                    full_corpus, context.cache_dir
+                )
+            cutoff = get_cutoff_for_token(token)
+            matches = close_matches(token, results.matcher, cutoff, tiers)
+            # re-check lowercase version of the word when there are no matches
+            if not matches and token != token.lower():
+                matches = close_matches(token.lower(), results.matcher, cutoff, tiers)
+
         failed = False
-        matches = difflib.get_close_matches(
-            token, current_corpus, cutoff=get_cutoff_for_token(token)
-        )
-        # re-check lowercase version of the word when there are no matches
-        if not matches and token != token.lower():
-            matches = difflib.get_close_matches(
-                token.lower(), current_corpus, cutoff=get_cutoff_for_token(token)
-            )
         if matches:
             if filename not in context.found_error_locations:
                 context.found_error_locations[filename] = []
+            results.found_error_matches[token] = matches
             context.found_error_matches[token] = matches
-            context.found_error_locations[filename].append(location_item)
+            context.found_error_locations[filename].append(location_item + (matches,))
             failed = True
             if context.failfast:
                 return
 
         if not failed:
-            context.non_error_non_corpus_words.add(token)
+            results.non_error_non_corpus_words.add(token)
+            if token in project_names:
+                vocabulary.record_no_match(token)
     return
 
 
 def print_file_errors(filename, errors):
     print("\033[1m" + filename + "\033[0m:")
-    for token, line, pos, lineno in errors:
-        matches = CONTEXT.found_error_matches[token]
+    for token, line, pos, lineno, matches in errors:
         if CONTEXT.show_all_matches:
             message = f"'{token}' appears similar to {','.join(matches)}"
         else:
@@ -248,29 +438,214 @@ def print_file_errors(filename, errors):
         )
 
 
-def parse_corpus(filenames):
-    corpus = set(FULL_CORPUS)
+def _read_corpus_files(filenames):
+    # each line of a file is a word, unless the file has turned on affix
+    # entries with AFFIX_HEADER, after which lines of the form 'stem/FLAGS'
+    # are expanded with the suffix rules
+    # words such as 'TCP/IP' which are not valid entries are still read as
+    # they are
     for filename in filenames:
+        affixes = False
         with open(filename) as fp:
             for line in fp:
                 line = line.strip()
+                if line == AFFIX_HEADER:
+                    affixes = True
+                    continue
                 if line.startswith("#") or line == "":
                     continue
-                corpus.add(line)
-    if CONTEXT.ascii_ize:
-        normalized = set(
-            (
-                unicodedata.normalize("NFKD", word)
-                .encode("ascii", "ignore")
-                .decode("utf-8")
+                if affixes and "/" in line:
+                    try:
+                        yield from expand_entry(line)
+                        continue
+                    except ValueError:
+                        pass
+                yield line
+
+
+def parse_misspellings(filenames):
+    # the builtin table of known misspellings, extended by the files given
+    # each line of a file has the form 'typo->correction', or
+    # 'typo->correction, correction, ...' for typos with several corrections
+    from .builtin_corpus.known_misspellings import KNOWN_MISSPELLINGS
+
+    table = {typo: [correction] for typo, correction in KNOWN_MISSPELLINGS.items()}
+    for filename in filenames:
+        with open(filename) as fp:
+            for lineno, line in enumerate(fp, 1):
+                line = line.strip()
+                if line.startswith("#") or line == "":
+                    continue
+                typo, sep, corrections = line.partition("->")
+                corrections = [c.strip() for c in corrections.split(",") if c.strip()]
+                if not sep or not typo.strip() or not corrections:
+                    raise ValueError(
+                        f"{filename}:{lineno}: expected 'typo->correction', "
+                        f"got '{line}'"
+                    )
+                table[typo.strip()] = corrections
+    return table
+
+
+def _read_added_words(corpus, filenames):
+    # stream the words which the corpus files add to `corpus`
+    # the builtin corpus already includes its ASCII-ized variants, so only the
+    # added words need to be normalized
+    return new_words(_read_corpus_files(filenames), corpus, CONTEXT.ascii_ize)
+
+
+def _load_or_build_corpus(backend, cache_path, read_words):
+    # load a compiled corpus from `cache_path`, or build it from the words
+    # returned by `read_words()` and cache it there
+    if cache_path:
+        try:
+            return load_or_write_cache_file(
+                cache_path, backend.load, lambda path: backend.write(path, read_words())
+            )
+        except (OSError, ValueError) as err:
+            if CONTEXT.verbose:
+                print(f"WARNING: could not write corpus cache: {err}")
+    return backend.from_words(read_words())
+
+
+def parse_corpus(filenames):
+    backend = get_corpus_backend(CONTEXT.corpus_backend)
+    corpus = load_builtin_corpus(
+        ascii_ize=CONTEXT.ascii_ize,
+        backend=CONTEXT.corpus_backend,
+        cache_dir=CONTEXT.cache_dir,
+    )
+
+    system_dict = CONTEXT.system_dict
+    if system_dict and not os.path.exists(system_dict):
+        print(f"WARNING: cannot load system dictionary {system_dict}, skipping")
+        system_dict = None
+    if system_dict:
+        # the system dictionary is streamed straight into the compiled corpus,
+        # which is cached by the file's inode and mtime
+        cache_path = None
+        if CONTEXT.cache_dir:
+            cache_path = system_dict_cache_path(
+                CONTEXT.cache_dir, system_dict, CONTEXT.ascii_ize, backend.suffix
+            )
+        system_dict_corpus = _load_or_build_corpus(
+            backend,
+            cache_path,
+            lambda: read_system_dict(system_dict, corpus, CONTEXT.ascii_ize),
+        )
+        corpus = corpus.union(system_dict_corpus)
+
+    if filenames:
+        # the words added to the builtin corpus are cached in compiled form, so
+        # that runs with unchanged corpus files skip reading and normalizing them
+        cache_path = None
+        if CONTEXT.cache_dir:
+            cache_path = corpus_cache_path(
+                CONTEXT.cache_dir,
+                filenames,
+                CONTEXT.ascii_ize,
+                backend.suffix,
+                system_dict=system_dict,
+            )
+        added_corpus = _load_or_build_corpus(
+            backend, cache_path, lambda: _read_added_words(corpus, filenames)
+        )
+        corpus = corpus.union(added_corpus)
+
+    # the builtin categories of terms are added last, so that the cached
+    # corpora above don't depend on which categories are in use
+    if CONTEXT.builtin_categories:
+        corpus = corpus.union(
+            load_builtin_categories(
+                CONTEXT.builtin_categories,
+                corpus,
+                ascii_ize=CONTEXT.ascii_ize,
+                backend=CONTEXT.corpus_backend,
             )
-            for word in corpus
         )
-        corpus = corpus | normalized
     return lengthmapped_corpus(corpus)
 
 
+def parse_overlay(lengthmap, filenames):
+    # a corpus of the words of `filenames` layered over the corpus of
+    # `lengthmap`, which is shared rather than copied
+    base = lengthmap[0]
+    backend = get_corpus_backend(CONTEXT.corpus_backend)
+    overlay = backend.from_words(_read_added_words(base, filenames))
+    return lengthmapped_corpus(CorpusUnion(base, overlay))
+
+
+class _Overlays:
+    # finds the corpus overlay files which apply to each checked file: those
+    # named `overlay_filename` in the file's directory and the directories
+    # above it, up to the current directory
+    # files outside the current directory have no overlays
+    #
+    # files with the same overlays share a length map, which is layered over
+    # the base length map and only built when first needed
+    def __init__(self, base_lengthmap, overlay_filename):
+        self._filename = overlay_filename
+        self._root = os.getcwd()
+        # keyed by directory, the paths of the overlay files for that directory,
+        # outermost first
+        self._chains = {}
+        # keyed by tuples of overlay paths
+        self._lengthmaps = {(): base_lengthmap}
+
+    def _chain(self, directory):
+        try:
+            return self._chains[directory]
+        except KeyError:
+            pass
+        if not self._under_root(directory):
+            chain = ()
+        else:
+            if directory == self._root:
+                chain = ()
+            else:
+                chain = self._chain(os.path.dirname(directory))
+            path = os.path.join(directory, self._filename)
+            if os.path.isfile(path):
+                chain += (path,)
+        self._chains[directory] = chain
+        return chain
+
+    def _under_root(self, directory):
+        try:
+            return os.path.commonpath([directory, self._root]) == self._root
+        except ValueError:
+            # the paths are on different drives
+            return False
+
+    def lengthmap_for(self, filename):
+        chain = self._chain(os.path.dirname(os.path.abspath(filename)))
+        if chain not in self._lengthmaps:
+            base = self._lengthmaps[()]
+            lengthmap = _DeferredLengthMap(lambda: parse_overlay(base, chain))
+            lengthmap.results.overlay = True
+            self._lengthmaps[chain] = lengthmap
+        return self._lengthmaps[chain]
+
+
+def _parse_categories(value):
+    if value in ("all", "auto"):
+        return value
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in CATEGORIES]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown categories: {', '.join(unknown)} "
+            f"(choose from {', '.join(CATEGORIES)})"
+        )
+    return names
+
+
 def main():
+    # imported here rather than at the top of the module so that the package
+    # can be imported (e.g. to compile the builtin corpus at build time)
+    # without its runtime dependencies installed
+    from identify import identify
+
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "--corpus",
@@ -279,6 +654,9 @@ def main():
         help=(
             "The path to a file containing newline-delimited known words. "
             "Comments (with '#') and empty lines are allowed in the corpus. "
+            f"After a '{AFFIX_HEADER}' line, lines of the form 'stem/FLAGS' add "
+            "the stem and the words derived from it by the suffix rules named by "
+            "FLAGS, as in the builtin SCOWL list. "
             "This option may be passed multiple times."
         ),
     )
@@ -309,12 +687,198 @@ def main():
         action="store_true",
         help=("Show all of the best matches for a word, not just the best one"),
     )
+    parser.add_argument(
+        "--exhaustive-matching",
+        default=False,
+        action="store_true",
+        help=(
+            "Always compare unknown words against the whole corpus. By default, "
+            "when only the best match is shown, tiers of common words are "
+            "searched first and the search stops at the first tier with a "
+            "match. With an exact matcher (difflib, automaton, ngram or "
+            "bitparallel, over the sets or dawg backend) the same words are "
+            "reported either way, but the suggested match can differ when a "
+            "closer, less common word exists. With approximate matching "
+            "(symspell, or the sqlite backend) tiers can also find matches "
+            "which the search of the whole corpus misses."
+        ),
+    )
+    parser.add_argument(
+        "--matcher",
+        choices=MATCHER_NAMES,
+        default="difflib",
+        help=(
+            "How to find close matches for unknown words. 'difflib' compares "
+            "each word with every word of the corpus which has enough "
+            "characters in common with it to be a close match. "
+            "'symspell' uses an index of the words with up to two characters "
+            "deleted from their first seven, which is cached with the corpus "
+            "and finds matches far faster, but is approximate: matches which "
+            "differ by more than two edits near the start of the word are "
+            "missed. 'automaton' walks a Levenshtein automaton over a word graph "
+            "of the corpus, also finding exactly the same matches as 'difflib'. "
+            "It uses the graph of '--corpus-backend dawg' directly, and caches "
+            "graphs of other corpora. 'ngram' scores only the words which share "
+            "enough trigrams (or bigrams, for short words) with the word to be a "
+            "close match, using an inverted index which is cached with the "
+            "corpus, and also finds exactly the same matches as 'difflib'. "
+            "'bitparallel' narrows the words which 'difflib' would score to "
+            "those whose longest common subsequence with the word, computed "
+            "with bit-parallel operations, is long enough for a close match, "
+            "and finds exactly the same matches. [default=difflib]"
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=user_cache_dir(),
+        help=(
+            "The directory in which to cache compiled corpora, so that corpus "
+            "files are only processed again when they change. "
+            "[default=%(default)s]"
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_const",
+        const=None,
+        default=argparse.SUPPRESS,
+        dest="cache_dir",
+        help="Don't read or write the compiled corpus cache",
+    )
+    parser.add_argument(
+        "--corpus-backend",
+        choices=CORPUS_BACKEND_NAMES,
+        default="sets",
+        help=(
+            "How to hold the corpus in memory. 'sets' is the fastest. 'dawg' "
+            "uses a compact word graph, which needs far less memory but makes "
+            "lookups and matching slower. 'sqlite' keeps the corpus in an SQLite "
+            "database which processes share, and only scores the words which "
+            "share the most trigrams with each unknown word, so matching is "
+            "faster but approximate, and its database of the builtin corpus "
+            "is built in the cache directory when first used. [default=sets]"
+        ),
+    )
+    parser.add_argument(
+        "--system-dict",
+        action="store_const",
+        const=SYSTEM_DICT_PATH,
+        default=None,
+        help=(
+            "Add the words of the system dictionary to the corpus. "
+            f"[path={SYSTEM_DICT_PATH}]"
+        ),
+    )
+    parser.add_argument(
+        "--system-dict-path",
+        dest="system_dict",
+        help="Add the words of the dictionary at this path to the corpus",
+    )
+    parser.add_argument(
+        "--builtin-categories",
+        type=_parse_categories,
+        default="all",
+        help=(
+            "The categories of software terms to add to the builtin corpus, as "
+            "a comma-separated list, 'all', or 'auto' to choose them by the "
+            "types of the files being checked. "
+            f"Categories: {', '.join(CATEGORIES)}. [default=all]"
+        ),
+    )
+    parser.add_argument(
+        "--overlay-filename",
+        default=OVERLAY_FILENAME,
+        help=(
+            "The name of per-directory corpus files. Files with this name are "
+            "discovered in the directory of each checked file and the "
+            "directories above it, up to the current directory, and their words "
+            "are known only when checking files below them. They have the same "
+            "format as --corpus files. [default=%(default)s]"
+        ),
+    )
+    parser.add_argument(
+        "--no-overlays",
+        action="store_const",
+        const=None,
+        default=argparse.SUPPRESS,
+        dest="overlay_filename",
+        help="Don't look for per-directory corpus files",
+    )
+    parser.add_argument(
+        "--misspellings",
+        action="append",
+        default=[],
+        help=(
+            "The path to a file of known misspellings, one per line in the form "
+            "'typo->correction' (or 'typo->correction, correction, ...'), which "
+            "are added to the builtin table. Known misspellings are reported "
+            "without fuzzy matching. This option may be passed multiple times."
+        ),
+    )
+    parser.add_argument(
+        "--project-vocabulary",
+        action="store_true",
+        default=False,
+        help=(
+            "Harvest the names defined and imported by the checked Python files "
+            "(functions, classes, modules) into a project vocabulary, and "
+            "remember which of them have no close match in the corpus, so that "
+            "they aren't matched again in later runs of the files which define "
+            "them. Names with a close match are still reported. The vocabulary "
+            "is kept in the cache directory, only updated for files which have "
+            "changed, and forgotten when the corpus changes."
+        ),
+    )
     parser.add_argument("--exclude", action="append", help="Files to skip", default=[])
     parser.add_argument("files", nargs="+", help="Files to check.")
     args = parser.parse_args()
+    if args.builtin_categories == "all":
+        args.builtin_categories = list(CATEGORIES)
+    elif args.builtin_categories == "auto":
+        args.builtin_categories = set()
+        for filename in args.files:
+            if filename not in args.exclude:
+                tags = identify.tags_from_path(filename)
+                args.builtin_categories |= categories_for_tags(tags)
     CONTEXT.set_args(args)
+    if args.misspellings:
+        # misspelling files are read before any file is checked, so that a
+        # mistake in one is reported rather than ending the run part way
+        try:
+            CONTEXT.known_misspellings = parse_misspellings(args.misspellings)
+        except (OSError, ValueError) as err:
+            parser.error(f"--misspellings: {err}")
+
+    if args.project_vocabulary:
+        # ast and json are only imported by runs which use the vocabulary
+        from .vocabulary import ProjectVocabulary
+
+        vocabulary_path = None
+        if CONTEXT.cache_dir:
+            vocabulary_path = vocabulary_cache_path(CONTEXT.cache_dir, os.getcwd())
+        key = corpus_key(
+            args.corpus,
+            args.misspellings,
+            CONTEXT.system_dict,
+            (
+                CONTEXT.ascii_ize,
+                CONTEXT.corpus_backend,
+                CONTEXT.matcher,
+                sorted(CONTEXT.builtin_categories),
+            ),
+        )
+        CONTEXT.project_vocabulary = ProjectVocabulary(vocabulary_path, key)
+        for filename in args.files:
+            if filename in args.exclude:
+                continue
+            if "python" in identify.tags_from_path(filename):
+                CONTEXT.project_vocabulary.update(filename)
 
-    lengthmap = parse_corpus(args.corpus)
+    lengthmap = _DeferredLengthMap(lambda: parse_corpus(args.corpus))
+    lengthmap.results.uses_vocabulary = True
+    overlays = None
+    if args.overlay_filename:
+        overlays = _Overlays(lengthmap, args.overlay_filename)
 
     for filename in args.files:
         if filename in args.exclude:
@@ -334,10 +898,23 @@ def main():
             print(f"WARNING: cannot check {filename} as it is not a supported filetype")
             continue
 
-        check_tokenstream(filename, tokenizer, CONTEXT, lengthmap)
+        file_lengthmap = overlays.lengthmap_for(filename) if overlays else lengthmap
+        check_tokenstream(filename, tokenizer, CONTEXT, file_lengthmap)
         if CONTEXT.found_error_matches:
             if CONTEXT.failfast:
                 break
+    if CONTEXT.project_vocabulary:
+        try:
+            CONTEXT.project_vocabulary.save()
+        except OSError as err:
+            if CONTEXT.verbose:
+                print(f"WARNING: could not write project vocabulary: {err}")
+    if CONTEXT.verbose:
+        print(
+            f"fuzzy matching: {CONTEXT.fuzzy_scans} scans, "
+            f"{CONTEXT.known_misspelling_hits} avoided by known misspellings, "
+            f"{CONTEXT.vocabulary_hits} avoided by the project vocabulary"
+        )
     if CONTEXT.found_error_matches:
         print("Spelling errors were encountered.")
         for filename in args.files:
@@ -0,0 +1,95 @@
+# Hunspell-style suffix rules, for storing word lists compactly
+#
+# a word list is stored as entries of the form "stem/FLAGS", where each flag
+# names a suffix rule which derives another word from the stem, e.g.
+#
+#   "anonymize/dgS"  ->  "anonymize", "anonymized", "anonymizing", "anonymizes"
+#
+# entries without a "/" are plain words
+#
+# each rule is a (strip, add) pair: the derived word is the stem with `strip`
+# removed from its end and `add` appended
+# unlike Hunspell, rules have no conditions beyond the stem ending in `strip`,
+# and every stem is itself a word of the list
+SUFFIX_RULES = {
+    "S": ("", "s"),
+    "E": ("", "es"),
+    "I": ("y", "ies"),
+    "D": ("", "ed"),
+    "d": ("", "d"),
+    "J": ("y", "ied"),
+    "G": ("", "ing"),
+    "g": ("e", "ing"),
+    "M": ("", "'s"),
+    "R": ("", "er"),
+    "r": ("", "r"),
+    "Y": ("", "ly"),
+    "N": ("", "ness"),
+    "T": ("", "est"),
+    "t": ("", "st"),
+    "Z": ("", "ism"),
+    "A": ("e", "ation"),
+    "P": ("", "ment"),
+    "L": ("", "less"),
+    "X": ("", "ist"),
+}
+
+# the rule flags in the order in which they are tried when compressing
+_FLAG_ORDER = "MSGDYdgRIENrZAXPTLJt"
+assert sorted(_FLAG_ORDER) == sorted(SUFFIX_RULES)
+
+
+def apply_rule(stem, flag):
+    if flag not in SUFFIX_RULES:
+        raise ValueError(f"unknown suffix rule '{flag}' for '{stem}'")
+    strip, add = SUFFIX_RULES[flag]
+    if not stem.endswith(strip):
+        raise ValueError(f"suffix rule '{flag}' does not apply to '{stem}'")
+    return stem[: len(stem) - len(strip)] + add
+
+
+def expand_entry(entry):
+    # the words of an entry, starting with its stem
+    stem, _, flags = entry.partition("/")
+    return [stem] + [apply_rule(stem, flag) for flag in flags]
+
+
+def expand_entries(entries):
+    words = []
+    for entry in entries:
+        words += expand_entry(entry)
+    return words
+
+
+def compress_words(words):
+    # the sorted entries for a collection of words, such that expanding them
+    # gives back exactly the same words
+    #
+    # a word is derived from a shorter word of the collection when a rule
+    # allows it, but never from a word which is itself derived, so that every
+    # stem is an entry of its own
+    words = frozenset(words)
+    for word in words:
+        if "/" in word:
+            raise ValueError(f"cannot compress a word containing '/': '{word}'")
+
+    flags = {}
+    # every rule adds more than it strips, so stems are always shorter than
+    # the words which derive from them and are seen first
+    for word in sorted(words, key=len):
+        for flag in _FLAG_ORDER:
+            strip, add = SUFFIX_RULES[flag]
+            if not word.endswith(add) or len(word) == len(add):
+                continue
+            stem = word[: len(word) - len(add)] + strip
+            if stem in flags:
+                flags[stem] += flag
+                break
+        else:
+            flags[word] = ""
+    entries = []
+    for stem, stem_flags in flags.items():
+        if stem_flags:
+            stem += "/" + "".join(sorted(stem_flags, key=_FLAG_ORDER.index))
+        entries.append(stem)
+    return sorted(entries)
@@ -1,19 +1,4 @@
-from .known_env_vars import KNOWN_ENV_VARS
-from .language_terms import (
-    BASH_TERMS,
-    C_TERMS,
-    JAVA_TERMS,
-    JS_TERMS,
-    MARKDOWN_TERMS,
-    RUBY_TERMS,
-    SQL_TERMS,
-)
-from .os_terms import LINUX_TERMS, MACOS_TERMS, UNIX_TERMS
-from .proper_nouns import PROPER_NOUNS
-from .python_terms import PYTHON_TERMS
-from .scowl_wordlist import SCOWL_CORPUS
-from .software_terms import SOFTWARE_TERMS
-from .web_terms import HTML_TERMS, HTTP_TERMS, SSL_TERMS
+import importlib
 
 # these additions aren't part of any software-specific set of words
 # they're just common (valid?) usages which don't appear in the SCOWL list
@@ -22,24 +7,108 @@ BASE_CORPUS_ADDITIONS = [
     "unintuitively",
 ]
 
-FULL_CORPUS = (
-    SCOWL_CORPUS
-    + BASE_CORPUS_ADDITIONS
-    + HTML_TERMS
-    + HTTP_TERMS
-    + C_TERMS
-    + JAVA_TERMS
-    + JS_TERMS
-    + SSL_TERMS
-    + KNOWN_ENV_VARS
-    + LINUX_TERMS
-    + MACOS_TERMS
-    + MARKDOWN_TERMS
-    + PROPER_NOUNS
-    + PYTHON_TERMS
-    + RUBY_TERMS
-    + BASH_TERMS
-    + SQL_TERMS
-    + SOFTWARE_TERMS
-    + UNIX_TERMS
+# the categories of terms which are added to the SCOWL list, mapping each name
+# to the module and list which hold its terms
+# modules are only imported when their category is used
+CATEGORIES = {
+    "bash": ("language_terms", "BASH_TERMS"),
+    "c": ("language_terms", "C_TERMS"),
+    "env-vars": ("known_env_vars", "KNOWN_ENV_VARS"),
+    "html": ("web_terms", "HTML_TERMS"),
+    "http": ("web_terms", "HTTP_TERMS"),
+    "java": ("language_terms", "JAVA_TERMS"),
+    "js": ("language_terms", "JS_TERMS"),
+    "linux": ("os_terms", "LINUX_TERMS"),
+    "macos": ("os_terms", "MACOS_TERMS"),
+    "markdown": ("language_terms", "MARKDOWN_TERMS"),
+    "proper-nouns": ("proper_nouns", "PROPER_NOUNS"),
+    "python": ("python_terms", "PYTHON_TERMS"),
+    "ruby": ("language_terms", "RUBY_TERMS"),
+    "software": ("software_terms", "SOFTWARE_TERMS"),
+    "sql": ("language_terms", "SQL_TERMS"),
+    "ssl": ("web_terms", "SSL_TERMS"),
+    "unix": ("os_terms", "UNIX_TERMS"),
+}
+
+# when categories are chosen by the types of the files being checked, these
+# are always used
+COMMON_CATEGORIES = (
+    "env-vars",
+    "http",
+    "linux",
+    "macos",
+    "proper-nouns",
+    "software",
+    "ssl",
+    "unix",
+)
+
+# ordered mapping of tags to the categories used for files with those tags
+FILETYPE_CATEGORIES = [
+    ("python", ("python",)),
+    ("shell", ("bash",)),
+    ("c", ("c",)),
+    ("c++", ("c",)),
+    ("java", ("java",)),
+    ("javascript", ("js",)),
+    ("ts", ("js",)),
+    ("markdown", ("markdown",)),
+    ("html", ("html",)),
+    ("ruby", ("ruby",)),
+    ("sql", ("sql",)),
+]
+
+
+# the order of the categories in FULL_CORPUS
+_FULL_CORPUS_CATEGORIES = (
+    "html",
+    "http",
+    "c",
+    "java",
+    "js",
+    "ssl",
+    "env-vars",
+    "linux",
+    "macos",
+    "markdown",
+    "proper-nouns",
+    "python",
+    "ruby",
+    "bash",
+    "sql",
+    "software",
+    "unix",
 )
+
+
+def __getattr__(name):
+    # FULL_CORPUS, the list of every builtin word, is kept for users of the
+    # library, but importing it imports every wordlist module, so it is only
+    # built when first used
+    if name == "FULL_CORPUS":
+        full_corpus = core_corpus()
+        for category in _FULL_CORPUS_CATEGORIES:
+            full_corpus += category_terms(category)
+        globals()[name] = full_corpus
+        return full_corpus
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def core_corpus():
+    # the SCOWL list and the base additions, which are used for all files
+    from .scowl_wordlist import SCOWL_CORPUS
+
+    return SCOWL_CORPUS + BASE_CORPUS_ADDITIONS
+
+
+def category_terms(name):
+    module, attr = CATEGORIES[name]
+    return getattr(importlib.import_module(f".{module}", __name__), attr)
+
+
+def categories_for_tags(tags):
+    categories = set(COMMON_CATEGORIES)
+    for tag, tag_categories in FILETYPE_CATEGORIES:
+        if tag in tags:
+            categories.update(tag_categories)
+    return categories
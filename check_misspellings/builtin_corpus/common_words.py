@@ -0,0 +1,379 @@
+# common English words, in tiers from most to least frequent
+# these are searched before the rest of the corpus when looking for the best
+# match for an unknown word, since a typo is most likely a typo of a common word
+COMMON_WORD_TIERS = [
+    [
+        "about",
+        "after",
+        "again",
+        "also",
+        "always",
+        "another",
+        "because",
+        "been",
+        "before",
+        "being",
+        "between",
+        "both",
+        "come",
+        "could",
+        "does",
+        "down",
+        "each",
+        "even",
+        "every",
+        "first",
+        "from",
+        "give",
+        "good",
+        "great",
+        "have",
+        "here",
+        "into",
+        "just",
+        "know",
+        "like",
+        "little",
+        "long",
+        "look",
+        "made",
+        "make",
+        "many",
+        "more",
+        "most",
+        "much",
+        "must",
+        "never",
+        "number",
+        "only",
+        "other",
+        "over",
+        "people",
+        "place",
+        "right",
+        "said",
+        "same",
+        "should",
+        "some",
+        "still",
+        "such",
+        "take",
+        "than",
+        "that",
+        "their",
+        "them",
+        "then",
+        "there",
+        "these",
+        "they",
+        "thing",
+        "think",
+        "this",
+        "those",
+        "though",
+        "three",
+        "through",
+        "time",
+        "under",
+        "very",
+        "want",
+        "well",
+        "were",
+        "what",
+        "when",
+        "where",
+        "which",
+        "while",
+        "will",
+        "with",
+        "without",
+        "work",
+        "would",
+        "year",
+        "your",
+    ],
+    [
+        "able",
+        "above",
+        "access",
+        "account",
+        "across",
+        "action",
+        "actually",
+        "added",
+        "address",
+        "against",
+        "allow",
+        "almost",
+        "alone",
+        "along",
+        "already",
+        "although",
+        "among",
+        "amount",
+        "answer",
+        "anything",
+        "appear",
+        "application",
+        "around",
+        "available",
+        "away",
+        "back",
+        "based",
+        "became",
+        "become",
+        "begin",
+        "beginning",
+        "behind",
+        "believe",
+        "below",
+        "best",
+        "better",
+        "beyond",
+        "body",
+        "book",
+        "build",
+        "business",
+        "call",
+        "called",
+        "came",
+        "cannot",
+        "case",
+        "cause",
+        "certain",
+        "change",
+        "changes",
+        "character",
+        "check",
+        "child",
+        "class",
+        "clear",
+        "close",
+        "code",
+        "command",
+        "common",
+        "complete",
+        "condition",
+        "consider",
+        "contain",
+        "contains",
+        "content",
+        "continue",
+        "control",
+        "correct",
+        "course",
+        "create",
+        "current",
+        "data",
+        "default",
+        "define",
+        "definition",
+        "describe",
+        "description",
+        "different",
+        "directory",
+        "document",
+        "done",
+        "during",
+        "early",
+        "either",
+        "else",
+        "empty",
+        "enough",
+        "environment",
+        "error",
+        "example",
+        "except",
+        "exist",
+        "expected",
+        "experience",
+        "explain",
+        "face",
+        "fact",
+        "fail",
+        "false",
+        "family",
+        "feel",
+        "field",
+        "file",
+        "final",
+        "find",
+        "follow",
+        "following",
+        "force",
+        "form",
+        "format",
+        "found",
+        "four",
+        "free",
+        "friend",
+        "full",
+        "function",
+        "further",
+        "general",
+        "given",
+        "going",
+        "government",
+        "group",
+        "hand",
+        "happen",
+        "happened",
+        "head",
+        "hear",
+        "help",
+        "high",
+        "himself",
+        "history",
+        "home",
+        "however",
+        "human",
+        "idea",
+        "important",
+        "include",
+        "including",
+        "information",
+        "inside",
+        "instead",
+        "interest",
+        "issue",
+        "itself",
+        "keep",
+        "kind",
+        "known",
+        "large",
+        "last",
+        "later",
+        "learn",
+        "least",
+        "leave",
+        "left",
+        "length",
+        "less",
+        "level",
+        "life",
+        "light",
+        "line",
+        "list",
+        "local",
+        "machine",
+        "main",
+        "mean",
+        "message",
+        "might",
+        "mind",
+        "missing",
+        "mode",
+        "moment",
+        "money",
+        "move",
+        "name",
+        "near",
+        "necessary",
+        "need",
+        "next",
+        "night",
+        "nothing",
+        "object",
+        "often",
+        "once",
+        "open",
+        "option",
+        "order",
+        "original",
+        "output",
+        "part",
+        "pass",
+        "path",
+        "perhaps",
+        "person",
+        "point",
+        "possible",
+        "power",
+        "present",
+        "print",
+        "probably",
+        "problem",
+        "process",
+        "program",
+        "provide",
+        "public",
+        "question",
+        "quite",
+        "rather",
+        "read",
+        "real",
+        "really",
+        "reason",
+        "receive",
+        "received",
+        "remember",
+        "remove",
+        "require",
+        "required",
+        "result",
+        "return",
+        "room",
+        "rule",
+        "save",
+        "school",
+        "second",
+        "seem",
+        "send",
+        "separate",
+        "service",
+        "several",
+        "show",
+        "side",
+        "similar",
+        "simple",
+        "since",
+        "single",
+        "size",
+        "small",
+        "something",
+        "sometimes",
+        "source",
+        "special",
+        "start",
+        "state",
+        "step",
+        "story",
+        "string",
+        "study",
+        "support",
+        "sure",
+        "system",
+        "table",
+        "tell",
+        "test",
+        "text",
+        "themselves",
+        "together",
+        "told",
+        "took",
+        "toward",
+        "true",
+        "turn",
+        "type",
+        "until",
+        "upon",
+        "used",
+        "user",
+        "using",
+        "usually",
+        "value",
+        "variable",
+        "version",
+        "water",
+        "week",
+        "whether",
+        "whole",
+        "within",
+        "word",
+        "world",
+        "write",
+        "written",
+        "wrong",
+        "young",
+    ],
+]
@@ -0,0 +1,245 @@
+# common misspellings, mapped to their corrections
+# these are reported as soon as they are seen, without fuzzy matching
+#
+# no typo is in the builtin corpus (with every category of terms), and every
+# word of each correction is, though a correction may be a phrase ("a lot")
+KNOWN_MISSPELLINGS = {
+    "abscence": "absence",
+    "acceptible": "acceptable",
+    "accesible": "accessible",
+    "accidentaly": "accidentally",
+    "accomodate": "accommodate",
+    "accross": "across",
+    "acheive": "achieve",
+    "acknowlege": "acknowledge",
+    "adress": "address",
+    "agressive": "aggressive",
+    "aggresive": "aggressive",
+    "alot": "a lot",
+    "allready": "already",
+    "alse": "else",
+    "alwasy": "always",
+    "alwyas": "always",
+    "ammount": "amount",
+    "anual": "annual",
+    "apparant": "apparent",
+    "appearence": "appearance",
+    "arguement": "argument",
+    "assosiated": "associated",
+    "asynchonous": "asynchronous",
+    "atribute": "attribute",
+    "attemp": "attempt",
+    "attribue": "attribute",
+    "auxilary": "auxiliary",
+    "availabe": "available",
+    "availible": "available",
+    "avaliable": "available",
+    "becuase": "because",
+    "beacuse": "because",
+    "becasue": "because",
+    "befor": "before",
+    "begining": "beginning",
+    "beleive": "believe",
+    "belive": "believe",
+    "betwen": "between",
+    "boundry": "boundary",
+    "buisness": "business",
+    "catagory": "category",
+    "charachter": "character",
+    "charater": "character",
+    "choosen": "chosen",
+    "collegue": "colleague",
+    "comming": "coming",
+    "commited": "committed",
+    "commiting": "committing",
+    "comparision": "comparison",
+    "compatability": "compatibility",
+    "compatable": "compatible",
+    "compatiblity": "compatibility",
+    "completly": "completely",
+    "concious": "conscious",
+    "configuraiton": "configuration",
+    "conjuction": "conjunction",
+    "connnection": "connection",
+    "consistant": "consistent",
+    "containes": "contains",
+    "continous": "continuous",
+    "convertion": "conversion",
+    "correclty": "correctly",
+    "curent": "current",
+    "currenly": "currently",
+    "decleration": "declaration",
+    "definately": "definitely",
+    "definetly": "definitely",
+    "defintion": "definition",
+    "depricated": "deprecated",
+    "descripton": "description",
+    "desireable": "desirable",
+    "destory": "destroy",
+    "develoment": "development",
+    "developement": "development",
+    "diffrent": "different",
+    "dimention": "dimension",
+    "directoy": "directory",
+    "disapear": "disappear",
+    "disapoint": "disappoint",
+    "documenation": "documentation",
+    "doesnt": "doesn't",
+    "embarass": "embarrass",
+    "enviroment": "environment",
+    "enviornment": "environment",
+    "equivelant": "equivalent",
+    "equivalant": "equivalent",
+    "exausted": "exhausted",
+    "exection": "execution",
+    "exisiting": "existing",
+    "existance": "existence",
+    "existant": "existent",
+    "experiance": "experience",
+    "explicitely": "explicitly",
+    "exprected": "expected",
+    "extention": "extension",
+    "familar": "familiar",
+    "finaly": "finally",
+    "folowing": "following",
+    "foriegn": "foreign",
+    "formated": "formatted",
+    "forseeable": "foreseeable",
+    "fourty": "forty",
+    "freind": "friend",
+    "fucntion": "function",
+    "funciton": "function",
+    "functionnality": "functionality",
+    "futher": "further",
+    "gaurantee": "guarantee",
+    "garantee": "guarantee",
+    "generaly": "generally",
+    "goverment": "government",
+    "grammer": "grammar",
+    "happend": "happened",
+    "harrass": "harass",
+    "heirarchy": "hierarchy",
+    "hierachy": "hierarchy",
+    "ignorning": "ignoring",
+    "immediatly": "immediately",
+    "implemenation": "implementation",
+    "implmentation": "implementation",
+    "incompatable": "incompatible",
+    "independant": "independent",
+    "indentical": "identical",
+    "infomation": "information",
+    "initalize": "initialize",
+    "inital": "initial",
+    "instace": "instance",
+    "instanciate": "instantiate",
+    "intepreter": "interpreter",
+    "interupt": "interrupt",
+    "intial": "initial",
+    "irrelevent": "irrelevant",
+    "lenght": "length",
+    "libary": "library",
+    "librarys": "libraries",
+    "maintainance": "maintenance",
+    "maintenence": "maintenance",
+    "managment": "management",
+    "millenium": "millennium",
+    "mispell": "misspell",
+    "mispelled": "misspelled",
+    "neccessary": "necessary",
+    "necesary": "necessary",
+    "neccesary": "necessary",
+    "noticable": "noticeable",
+    "occassion": "occasion",
+    "occurence": "occurrence",
+    "occurance": "occurrence",
+    "occured": "occurred",
+    "occuring": "occurring",
+    "ommited": "omitted",
+    "ommit": "omit",
+    "optionnal": "optional",
+    "orignal": "original",
+    "overriden": "overridden",
+    "paramter": "parameter",
+    "paramters": "parameters",
+    "parrallel": "parallel",
+    "paralell": "parallel",
+    "particularily": "particularly",
+    "performace": "performance",
+    "permanant": "permanent",
+    "persistant": "persistent",
+    "posession": "possession",
+    "possibilty": "possibility",
+    "potentialy": "potentially",
+    "preceeding": "preceding",
+    "prefered": "preferred",
+    "presense": "presence",
+    "previosly": "previously",
+    "priviledge": "privilege",
+    "privilige": "privilege",
+    "probaly": "probably",
+    "proccess": "process",
+    "procesing": "processing",
+    "programatically": "programmatically",
+    "pronounciation": "pronunciation",
+    "propery": "property",
+    "publically": "publicly",
+    "reachs": "reaches",
+    "realy": "really",
+    "recieve": "receive",
+    "recieved": "received",
+    "reciever": "receiver",
+    "recomend": "recommend",
+    "recomended": "recommended",
+    "reccomend": "recommend",
+    "refered": "referred",
+    "refering": "referring",
+    "relevent": "relevant",
+    "remeber": "remember",
+    "repetion": "repetition",
+    "reponse": "response",
+    "represenation": "representation",
+    "requirment": "requirement",
+    "resouce": "resource",
+    "responsability": "responsibility",
+    "retreive": "retrieve",
+    "retrive": "retrieve",
+    "returnes": "returns",
+    "sentance": "sentence",
+    "seperate": "separate",
+    "seperated": "separated",
+    "seperator": "separator",
+    "sieze": "seize",
+    "similiar": "similar",
+    "simliar": "similar",
+    "speficied": "specified",
+    "specifed": "specified",
+    "succesful": "successful",
+    "successfull": "successful",
+    "sucessful": "successful",
+    "sufficent": "sufficient",
+    "suport": "support",
+    "supress": "suppress",
+    "suprise": "surprise",
+    "synchonize": "synchronize",
+    "temporarly": "temporarily",
+    "tendancy": "tendency",
+    "threshhold": "threshold",
+    "tommorow": "tomorrow",
+    "tounge": "tongue",
+    "transfered": "transferred",
+    "truely": "truly",
+    "unecessary": "unnecessary",
+    "unneccessary": "unnecessary",
+    "unkown": "unknown",
+    "untill": "until",
+    "usefull": "useful",
+    "usualy": "usually",
+    "valueable": "valuable",
+    "varialbe": "variable",
+    "verison": "version",
+    "visable": "visible",
+    "wierd": "weird",
+    "wich": "which",
+    "writting": "writing",
+    "writen": "written",
+}
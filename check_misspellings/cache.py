@@ -0,0 +1,221 @@
+import contextlib
+import os
+import sys
+import time
+
+# bump this whenever the contents of cached files change meaning, so that
+# caches written by older versions are not read
+_CACHE_FORMAT = 3
+# the most files of each kind (e.g. compiled corpora, or one kind of matcher
+# index) which are kept in the cache
+# cache files are keyed by their contents, so every change to a corpus file
+# adds new ones, and the least recently used are deleted whenever a new file
+# is written
+_KEEP_PER_KIND = 4
+# temporary files older than this were left by runs which were killed while
+# writing them, rather than by runs which are still writing them
+_STALE_TMP_SECONDS = 60 * 60
+
+
+def user_cache_dir():
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(
+            os.path.join("~", "AppData", "Local")
+        )
+    elif sys.platform == "darwin":
+        base = os.path.expanduser(os.path.join("~", "Library", "Caches"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(
+            os.path.join("~", ".cache")
+        )
+    return os.path.join(base, "check-misspellings")
+
+
+def _package_version():
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:  # python < 3.8
+        return "unknown"
+    try:
+        return version("check-misspellings")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def _file_identity(path):
+    # identify a file by where it is and when it last changed, without reading
+    # it, for files which are too large to hash on every run
+    st = os.stat(path)
+    parts = (os.path.realpath(path), st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+    return ":".join(map(str, parts))
+
+
+def _cache_key(ascii_ize):
+    # hashlib is slow to import, and only needed for runs which use the cache
+    import hashlib
+
+    key = hashlib.sha256()
+    key.update(f"{_CACHE_FORMAT}:{_package_version()}:{ascii_ize}".encode())
+    return key
+
+
+def system_dict_cache_path(cache_dir, path, ascii_ize, suffix):
+    # system dictionaries are keyed by inode and mtime, since they are large
+    # and only change when the system package which provides them is updated
+    key = _cache_key(ascii_ize)
+    key.update(_file_identity(path).encode())
+    return os.path.join(cache_dir, f"sysdict-{key.hexdigest()}{suffix}")
+
+
+def corpus_cache_path(cache_dir, filenames, ascii_ize, suffix, system_dict=None):
+    # the cache key covers everything which goes into building the corpus:
+    # the contents of the corpus files, the options which change how they are
+    # processed, and the package version (which determines the builtin corpus)
+    # words already in the system dictionary are left out of the corpus, so the
+    # system dictionary in use is part of the key too
+    import hashlib
+
+    key = _cache_key(ascii_ize)
+    if system_dict:
+        key.update(_file_identity(system_dict).encode())
+    for filename in filenames:
+        with open(filename, "rb") as fp:
+            key.update(hashlib.sha256(fp.read()).digest())
+    return os.path.join(cache_dir, f"corpus-{key.hexdigest()}{suffix}")
+
+
+def builtin_corpus_cache_path(cache_dir, name, sources, suffix):
+    # the builtin corpus, for backends which are not compiled when the package
+    # is built, is keyed by the files which it is built from
+    key = _cache_key(None)
+    for source in sources:
+        key.update(_file_identity(source).encode())
+    return os.path.join(cache_dir, f"{name}-{key.hexdigest()}{suffix}")
+
+
+def vocabulary_cache_path(cache_dir, project_root):
+    # project vocabularies are kept per project, which is identified by the
+    # directory that the tool runs in
+    key = _cache_key(None)
+    key.update(os.path.realpath(project_root).encode())
+    return os.path.join(cache_dir, f"vocabulary-{key.hexdigest()}.json")
+
+
+def corpus_key(corpus_files, misspelling_files, system_dict, options):
+    # a key for everything which decides whether a word has a close match: the
+    # contents of the corpus and misspelling files, the system dictionary, the
+    # other options which change the corpus or matching, and the package
+    # version (which determines the builtin corpus)
+    # returns None if any of the files can't be read
+    import hashlib
+
+    key = _cache_key(None)
+    key.update(repr(options).encode())
+    try:
+        if system_dict:
+            key.update(_file_identity(system_dict).encode())
+        for filenames in (corpus_files, misspelling_files):
+            key.update(f":{len(filenames)}:".encode())
+            for filename in filenames:
+                with open(filename, "rb") as fp:
+                    key.update(hashlib.sha256(fp.read()).digest())
+    except OSError:
+        return None
+    return key.hexdigest()
+
+
+def matcher_index_cache_path(cache_dir, name, digest=None, source_path=None):
+    # matcher indexes of corpora loaded from a file are keyed by the file, like
+    # system dictionaries, so that the corpus doesn't have to be read to find
+    # its index
+    # other indexes are keyed by a digest of the words they index, so that an
+    # index is shared by every corpus with the same words
+    key = _cache_key(None)
+    if source_path:
+        key.update(f"file:{_file_identity(source_path)}".encode())
+    else:
+        key.update(f"words:{digest}".encode())
+    return os.path.join(cache_dir, f"{name}-{key.hexdigest()}.idx")
+
+
+@contextlib.contextmanager
+def atomic_write_path(path):
+    # a temporary path to write a file to, which is moved to `path` when the
+    # block completes, so that concurrent readers never see a partially written
+    # file
+    # the temporary file is removed if the block fails
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+
+
+def load_or_write_cache_file(path, load, write):
+    # load the cache file `path` with `load(path)`, or if it can't be loaded,
+    # write it with `write(path)` and then load it
+    # raises OSError if the file can't be written, and otherwise whatever
+    # `load` raises for the file which was just written
+    try:
+        result = load(path)
+    except (OSError, ValueError):
+        pass
+    else:
+        touch_cache_file(path)
+        return result
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write(path)
+    prune_cache(path)
+    return load(path)
+
+
+def _cache_file_kind(name):
+    # cache files are named "<kind>-<key><suffix>"
+    prefix, sep, _ = name.partition("-")
+    if not sep or name.endswith(".tmp"):
+        return None
+    return prefix, os.path.splitext(name)[1]
+
+
+def touch_cache_file(path):
+    # mark a cache file as used, so that it is kept over files which haven't
+    # been used for longer
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def prune_cache(path, keep=_KEEP_PER_KIND):
+    # delete the least recently used cache files of the same kind as `path`,
+    # which has just been written, beyond the `keep` most recently used, and
+    # any temporary files left by runs which didn't finish writing them
+    cache_dir, name = os.path.split(path)
+    kind = _cache_file_kind(name)
+    if kind is None:
+        return
+    others = []
+    stale = []
+    stale_before = time.time() - _STALE_TMP_SECONDS
+    try:
+        for entry in os.scandir(cache_dir):
+            if entry.name.endswith(".tmp"):
+                if entry.stat().st_mtime < stale_before:
+                    stale.append(entry.path)
+            elif entry.name != name and _cache_file_kind(entry.name) == kind:
+                others.append((entry.stat().st_mtime_ns, entry.path))
+    except OSError:
+        return
+    # files may be in use by other processes, which is harmless where they
+    # can be deleted anyway (they stay readable until closed), and where they
+    # can't they are left for a later run
+    unused = [other for _, other in sorted(others, reverse=True)[keep - 1 :]]
+    for other in stale + unused:
+        try:
+            os.remove(other)
+        except OSError:
+            pass
@@ -0,0 +1,564 @@
+import collections
+import itertools
+import mmap
+import os
+import struct
+import sys
+import unicodedata
+
+from .cache import (
+    atomic_write_path,
+    builtin_corpus_cache_path,
+    load_or_write_cache_file,
+)
+
+# the builtin corpus is compiled into files in this directory when the package
+# is built, once for each of the backends in BUILTIN_CORPUS_BACKENDS
+# if they are missing (e.g. in a source checkout) we fall back to the python
+# wordlist modules, which are much slower to import
+# the other backends are built from these when first used, and kept in the
+# user's cache, so that the package doesn't ship a copy for every backend
+#
+# the ASCII-ized variants of builtin words are kept in separate files so that
+# they are only loaded when ASCII-ization is turned on
+BUILTIN_CORPUS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "builtin_corpus"
+)
+
+# possessive words ("admin's", "app's", ...) make up a large part of the
+# builtin corpus
+# they are not stored as words: a corpus stores the base forms of possessive
+# words, grouped by the length of the possessive, and derives the possessives
+# from those when needed
+POSSESSIVE_SUFFIX = "'s"
+
+# compiled corpus file layout (all integers are little-endian uint32):
+#
+#   header:   magic, number of sections
+#   sections: (word length, data offset, words size, bases size, flags) for
+#             each section
+#   data:     for each section, the sorted words of that length, followed by
+#             the sorted base forms of the possessive words of that length,
+#             each encoded as UTF-8 and joined with newlines
+#
+# flags say whether a section has any words and any bases, since an empty
+# string is a valid word (e.g. the base form of "'s")
+#
+# a section is only decoded when a word of its length is first needed, so the
+# cost of loading the file is just the cost of reading the section table
+_MAGIC = b"CMSCORP\x02"
+_HEADER = struct.Struct("<8sI")
+_SECTION = struct.Struct("<IIIII")
+_HAS_WORDS = 1
+_HAS_BASES = 2
+
+
+def _group_by_length(words):
+    # group words by length, separating possessive words (as base forms) from
+    # the rest
+    groups = {}
+    for word in words:
+        n = len(word)
+        if n not in groups:
+            groups[n] = (set(), set())
+        if word.endswith(POSSESSIVE_SUFFIX):
+            groups[n][1].add(word[: -len(POSSESSIVE_SUFFIX)])
+        else:
+            groups[n][0].add(word)
+    return {n: (frozenset(w), frozenset(b)) for n, (w, b) in groups.items()}
+
+
+def _title(s):
+    # don't use '.title()' because on "foo's" it produces "Foo'S"
+    if not s:
+        return s
+    return s[0].upper() + s[1:]
+
+
+def _contains_any_case(corpus, s):
+    return s in corpus or s.lower() in corpus or _title(s) in corpus
+
+
+def _ascii_ize(word):
+    return unicodedata.normalize("NFKD", word).encode("ascii", "ignore").decode("utf-8")
+
+
+def ascii_variants(words, corpus=()):
+    # ASCII-encode words (stripping accents, etc) to allow ASCII-content to
+    # match non-ASCII data
+    # only variants which are not already in `corpus` are returned
+    normalized = set(_ascii_ize(word) for word in words)
+    return set(word for word in normalized if word not in corpus)
+
+
+def new_words(words, corpus, ascii_ize=True):
+    # the words which are not already in `corpus`, each followed by its
+    # ASCII-ized variant when that is not in `corpus` either
+    #
+    # words are produced as they are read, so that a large word list can be
+    # sorted into a compiled corpus without first being collected in a set
+    # a word may be produced more than once
+    for word in words:
+        if word in corpus:
+            continue
+        yield word
+        if ascii_ize and not word.isascii():
+            variant = _ascii_ize(word)
+            if variant != word and variant not in corpus:
+                yield variant
+
+
+SYSTEM_DICT_PATH = "/usr/share/dict/words"
+
+
+def read_system_dict(path, corpus, ascii_ize=True):
+    # stream the new words of a system dictionary (e.g. /usr/share/dict/words),
+    # which has one word per line
+    with open(path, encoding="utf-8", errors="replace") as fp:
+        yield from new_words(filter(None, map(str.strip, fp)), corpus, ascii_ize)
+
+
+class WordCorpus:
+    # a set of known words, stored grouped by exact word length
+    #
+    # each group is a pair of the words of that length which are not
+    # possessive, and the base forms of the possessive words of that length
+    # groups are produced by `load_group` the first time that they are needed
+    # and then kept for the rest of the run
+
+    # the file which the corpus was loaded from, if any, which identifies it
+    # for caching its matcher indexes
+    source_path = None
+
+    def __init__(self, lengths, load_group):
+        self._lengths = frozenset(lengths)
+        self._load_group = load_group
+        self._groups = {}
+        self._cased_words_indexes = {}
+
+    @classmethod
+    def from_words(cls, words):
+        groups = _group_by_length(words)
+        return cls(groups.keys(), groups.__getitem__)
+
+    def lengths(self):
+        return sorted(self._lengths)
+
+    def _group(self, n):
+        try:
+            return self._groups[n]
+        except KeyError:
+            pass
+        if n in self._lengths:
+            group = self._load_group(n)
+        else:
+            group = (frozenset(), frozenset())
+        self._groups[n] = group
+        return group
+
+    def words_of_length(self, n):
+        words, bases = self._group(n)
+        if not bases:
+            return words
+        return itertools.chain(words, (base + POSSESSIVE_SUFFIX for base in bases))
+
+    def _cased_words_index(self, n):
+        # map the lowercase form of each ASCII word of length `n` which has
+        # uppercase letters to a tuple of the casings of it which are accepted
+        # lowercase words don't need an index: they are in the corpus group
+        try:
+            return self._cased_words_indexes[n]
+        except KeyError:
+            pass
+        index = {}
+        for word in itertools.filterfalse(str.islower, self._group(n)[0]):
+            folded = word.lower()
+            if folded == word or not word.isascii():
+                continue
+            # the word with its first letter lowercased title-cases back to the
+            # word, so it is accepted too
+            index[folded] = index.get(folded, ()) + (word, word[0].lower() + word[1:])
+        self._cased_words_indexes[n] = index
+        return index
+
+    def _contains_possessive_any_case(self, s):
+        # for an ASCII string ending in "'s" or "'S", check if it is a possessive
+        # word as-is, lowercased, or title-cased
+        # possessives always end in "'s", so these are checks of the stem
+        bases = self._group(len(s))[1]
+        if not bases:
+            return False
+        stem = s[: -len(POSSESSIVE_SUFFIX)]
+        if s.endswith(POSSESSIVE_SUFFIX):
+            return stem in bases or stem.lower() in bases or _title(stem) in bases
+        return stem.lower() in bases
+
+    def contains_any_case(self, s):
+        # check if `s` is in the corpus as-is, lowercased, or title-cased
+        #
+        # for ASCII strings all three forms share a lowercase form, so this is
+        # a lookup of the lowercase form in the corpus, falling back to a
+        # lookup in the index of words with uppercase letters
+        # for other strings, case mapping can change lengths and so each form
+        # is checked separately
+        if not s.isascii():
+            return _contains_any_case(self, s)
+        folded = s.lower()
+        if folded.endswith(POSSESSIVE_SUFFIX) and self._contains_possessive_any_case(s):
+            return True
+        if folded in self._group(len(s))[0]:
+            return True
+        accepted = self._cased_words_index(len(s)).get(folded)
+        return accepted is not None and s in accepted
+
+    def union(self, other):
+        # the corpora are kept apart rather than merged, so that matchers can
+        # index each of them separately, and share the indexes of corpora which
+        # don't change from run to run (e.g. the builtin corpus)
+        return CorpusUnion(self, other)
+
+    def iter_words(self, min_length, max_length):
+        return itertools.chain.from_iterable(
+            self.words_of_length(n)
+            for n in self.lengths()
+            if min_length <= n <= max_length
+        )
+
+    def iter_candidates(self, lengths, possessive_lengths, word=None):
+        # the non-possessive words with lengths in `lengths`, followed by the
+        # possessive words with lengths in `possessive_lengths`
+        # `word` is the word being matched, which backends with an index of
+        # similar words use to narrow the candidates, and which is unused here
+        words = itertools.chain.from_iterable(self._group(n)[0] for n in lengths)
+        possessives = (
+            base + POSSESSIVE_SUFFIX
+            for n in possessive_lengths
+            for base in self._group(n)[1]
+        )
+        return itertools.chain(words, possessives)
+
+    def slice(self, min_length, max_length):
+        return CorpusSlice(self, min_length, max_length)
+
+    def __contains__(self, word):
+        words, bases = self._group(len(word))
+        if word.endswith(POSSESSIVE_SUFFIX):
+            return word[: -len(POSSESSIVE_SUFFIX)] in bases
+        return word in words
+
+    def __iter__(self):
+        return self.iter_words(0, sys.maxsize)
+
+    def __len__(self):
+        return sum(
+            len(words) + len(bases) for words, bases in map(self._group, self._lengths)
+        )
+
+
+class CorpusSlice:
+    # a view of the words in a corpus whose lengths fall in a contiguous range
+    #
+    # this does not copy any words: membership checks and iteration go to the
+    # underlying corpus groups for each length in the range
+    def __init__(self, corpus, min_length, max_length):
+        self.corpus = corpus
+        self.min_length = min_length
+        self.max_length = max_length
+
+    def lengths(self):
+        return range(self.min_length, self.max_length + 1)
+
+    def words_of_length(self, n):
+        if self.min_length <= n <= self.max_length:
+            return self.corpus.words_of_length(n)
+        return frozenset()
+
+    def contains_any_case(self, s):
+        if not s.isascii():
+            return _contains_any_case(self, s)
+        if not self.min_length <= len(s) <= self.max_length:
+            return False
+        return self.corpus.contains_any_case(s)
+
+    def __contains__(self, word):
+        return self.min_length <= len(word) <= self.max_length and word in self.corpus
+
+    def iter_candidates(self, lengths, possessive_lengths, word=None):
+        return self.corpus.iter_candidates(
+            [n for n in lengths if self.min_length <= n <= self.max_length],
+            [n for n in possessive_lengths if self.min_length <= n <= self.max_length],
+            word,
+        )
+
+    def __iter__(self):
+        return self.corpus.iter_words(self.min_length, self.max_length)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class CorpusUnion:
+    # a view of the words in several corpora, which must not share any words
+    def __init__(self, *corpora):
+        self.corpora = corpora
+
+    def lengths(self):
+        return sorted(set().union(*(c.lengths() for c in self.corpora)))
+
+    def words_of_length(self, n):
+        return itertools.chain.from_iterable(c.words_of_length(n) for c in self.corpora)
+
+    def iter_words(self, min_length, max_length):
+        return itertools.chain.from_iterable(
+            c.iter_words(min_length, max_length) for c in self.corpora
+        )
+
+    def iter_candidates(self, lengths, possessive_lengths, word=None):
+        return itertools.chain.from_iterable(
+            c.iter_candidates(lengths, possessive_lengths, word) for c in self.corpora
+        )
+
+    def union(self, other):
+        return CorpusUnion(*self.corpora, other)
+
+    def slice(self, min_length, max_length):
+        return CorpusSlice(self, min_length, max_length)
+
+    def contains_any_case(self, s):
+        return any(c.contains_any_case(s) for c in self.corpora)
+
+    def __contains__(self, word):
+        return any(word in c for c in self.corpora)
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self.corpora)
+
+    def __len__(self):
+        return sum(len(c) for c in self.corpora)
+
+
+def _section_key(word):
+    # the sections of a compiled corpus file are in order of length, with the
+    # possessive words of each length after the others
+    return (len(word), word.endswith(POSSESSIVE_SUFFIX))
+
+
+def _decode_words(data):
+    return frozenset(data.decode("utf-8").split("\n"))
+
+
+def write_compiled_corpus(path, words):
+    # words are sorted into sections (spilling to disk if there are many of
+    # them) and streamed into a temporary data file section by section, so
+    # that the whole corpus is never held in memory at once
+    # (these imports are only needed when writing, so they are kept off the
+    # startup path)
+    import shutil
+    import tempfile
+
+    from .external_sort import sorted_groups
+
+    sections = {}
+    with tempfile.TemporaryFile() as data:
+        for (n, possessive), group in sorted_groups(words, _section_key):
+            start = data.tell()
+            separator = b""
+            for word in group:
+                if possessive:
+                    word = word[: -len(POSSESSIVE_SUFFIX)]
+                data.write(separator + word.encode("utf-8"))
+                separator = b"\n"
+            # sections are (offset, words size, bases size, flags), where the
+            # offset is relative to the start of the data
+            section = sections.setdefault(n, [start, 0, 0, 0])
+            if possessive:
+                section[2] = data.tell() - start
+                section[3] |= _HAS_BASES
+            else:
+                section[1] = data.tell() - start
+                section[3] |= _HAS_WORDS
+
+        # the sections are written once all their sizes are known, followed by
+        # the data
+        data_offset = _HEADER.size + _SECTION.size * len(sections)
+        with atomic_write_path(path) as tmp_path, open(tmp_path, "wb") as fp:
+            fp.write(_HEADER.pack(_MAGIC, len(sections)))
+            for n, (start, words_size, bases_size, flags) in sections.items():
+                fp.write(
+                    _SECTION.pack(n, data_offset + start, words_size, bases_size, flags)
+                )
+            data.seek(0)
+            shutil.copyfileobj(data, fp)
+
+
+def load_compiled_corpus(path):
+    with open(path, "rb") as fp:
+        data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        magic, count = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a compiled corpus file")
+        sections = {}
+        for i in range(count):
+            n, offset, words_size, bases_size, flags = _SECTION.unpack_from(
+                data, _HEADER.size + i * _SECTION.size
+            )
+            if offset + words_size + bases_size > len(data):
+                raise ValueError(f"{path} is truncated")
+            sections[n] = (offset, words_size, bases_size, flags)
+    except struct.error as err:
+        raise ValueError(f"{path} is not a compiled corpus file") from err
+
+    def load_group(n):
+        offset, words_size, bases_size, flags = sections[n]
+        words, bases = frozenset(), frozenset()
+        if flags & _HAS_WORDS:
+            words = _decode_words(data[offset : offset + words_size])
+        if flags & _HAS_BASES:
+            offset += words_size
+            bases = _decode_words(data[offset : offset + bases_size])
+        return (words, bases)
+
+    corpus = WordCorpus(sections.keys(), load_group)
+    corpus.source_path = path
+    return corpus
+
+
+# the ways in which a corpus can be held in memory, by name
+# each has a file format for compiled corpora (with a file suffix), and can
+# also be built directly from words
+CorpusBackend = collections.namedtuple(
+    "CorpusBackend", ("suffix", "write", "load", "from_words")
+)
+CORPUS_BACKEND_NAMES = ("sets", "dawg", "sqlite")
+# the backends whose builtin corpus is compiled when the package is built
+BUILTIN_CORPUS_BACKENDS = ("sets", "dawg")
+
+
+def get_corpus_backend(name):
+    if name == "dawg":
+        from .dawg import DawgCorpus, load_dawg, write_dawg
+
+        return CorpusBackend(".dawg", write_dawg, load_dawg, DawgCorpus.from_words)
+    if name == "sqlite":
+        from .sqlite import SqliteCorpus, load_sqlite_corpus, write_sqlite_corpus
+
+        return CorpusBackend(
+            ".sqlite", write_sqlite_corpus, load_sqlite_corpus, SqliteCorpus.from_words
+        )
+    if name == "sets":
+        return CorpusBackend(
+            ".bin", write_compiled_corpus, load_compiled_corpus, WordCorpus.from_words
+        )
+    raise ValueError(f"unknown corpus backend: {name}")
+
+
+def write_builtin_corpus(directory):
+    from .affixes import compress_words
+    from .builtin_corpus import core_corpus
+    from .builtin_corpus.scowl_wordlist import SCOWL_CORPUS, SCOWL_ENTRIES
+
+    # the SCOWL list is stored as affix-compressed entries, which must be
+    # exactly the entries that compressing its words gives, so that an edit
+    # to the list can't add a derived word twice or silently drop one
+    if compress_words(SCOWL_CORPUS) != SCOWL_ENTRIES:
+        raise ValueError(
+            "the SCOWL entries are not in compressed form, "
+            "rewrite them with check_misspellings.affixes.compress_words"
+        )
+
+    words = frozenset(core_corpus())
+    ascii_words = ascii_variants(words, words)
+    for name in BUILTIN_CORPUS_BACKENDS:
+        backend = get_corpus_backend(name)
+        backend.write(os.path.join(directory, "corpus" + backend.suffix), words)
+        backend.write(
+            os.path.join(directory, "corpus_ascii" + backend.suffix), ascii_words
+        )
+
+
+def _builtin_corpus_source(ascii_ize):
+    # the files which the core of the builtin corpus (or its ASCII-ized
+    # variants) is read from, and a function which reads its words
+    name = "corpus_ascii" if ascii_ize else "corpus"
+    compiled_path = os.path.join(BUILTIN_CORPUS_DIR, name + ".bin")
+    if os.path.exists(compiled_path):
+        return [compiled_path], lambda: load_compiled_corpus(compiled_path)
+
+    def read_words():
+        from .builtin_corpus import core_corpus
+
+        words = frozenset(core_corpus())
+        return ascii_variants(words, words) if ascii_ize else words
+
+    sources = [
+        os.path.join(BUILTIN_CORPUS_DIR, "__init__.py"),
+        os.path.join(BUILTIN_CORPUS_DIR, "scowl_wordlist.py"),
+    ]
+    return sources, read_words
+
+
+def _load_cached_builtin_corpus(backend, ascii_ize, cache_dir):
+    # load a part of the builtin corpus from the cache, building it there first
+    # if needed, or build it in memory if the cache can't be used
+    sources, read_words = _builtin_corpus_source(ascii_ize)
+    if cache_dir:
+        try:
+            path = builtin_corpus_cache_path(
+                cache_dir,
+                "builtin_ascii" if ascii_ize else "builtin",
+                sources,
+                backend.suffix,
+            )
+            return load_or_write_cache_file(
+                path, backend.load, lambda path: backend.write(path, read_words())
+            )
+        except (OSError, ValueError):
+            pass
+    return backend.from_words(read_words())
+
+
+def load_builtin_corpus(ascii_ize=True, backend="sets", cache_dir=None):
+    # load the core of the builtin corpus, without any categories of terms
+    # backends which are not compiled with the package are built in
+    # `cache_dir`, if given, the first time they are used
+    backend_name, backend = backend, get_corpus_backend(backend)
+    path = os.path.join(BUILTIN_CORPUS_DIR, "corpus" + backend.suffix)
+    ascii_path = os.path.join(BUILTIN_CORPUS_DIR, "corpus_ascii" + backend.suffix)
+    if os.path.exists(path):
+        corpus = backend.load(path)
+        if ascii_ize:
+            corpus = corpus.union(backend.load(ascii_path))
+        return corpus
+
+    if backend_name not in BUILTIN_CORPUS_BACKENDS:
+        corpus = _load_cached_builtin_corpus(backend, False, cache_dir)
+        if ascii_ize:
+            corpus = corpus.union(_load_cached_builtin_corpus(backend, True, cache_dir))
+        return corpus
+
+    from .builtin_corpus import core_corpus
+
+    words = frozenset(core_corpus())
+    corpus = backend.from_words(words)
+    if ascii_ize:
+        corpus = corpus.union(backend.from_words(ascii_variants(words, words)))
+    return corpus
+
+
+def load_builtin_categories(names, corpus, ascii_ize=True, backend="sets"):
+    # a corpus of the terms of the named categories which are not in `corpus`
+    # the categories are small, so they are not compiled ahead of time
+    from .builtin_corpus import category_terms
+
+    terms = itertools.chain.from_iterable(map(category_terms, sorted(names)))
+    return get_corpus_backend(backend).from_words(new_words(terms, corpus, ascii_ize))
+
+
+def load_frequency_tiers():
+    # the tiers of common words, most common first, each as a small corpus
+    # every tier is a subset of the core of the builtin corpus
+    from .builtin_corpus.common_words import COMMON_WORD_TIERS
+
+    return [WordCorpus.from_words(tier) for tier in COMMON_WORD_TIERS]
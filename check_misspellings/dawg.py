@@ -0,0 +1,409 @@
+import array
+import bisect
+import mmap
+import operator
+import struct
+import sys
+
+from .cache import atomic_write_path
+from .corpus import POSSESSIVE_SUFFIX, CorpusSlice, CorpusUnion, _contains_any_case
+from .external_sort import sorted_unique
+
+# a DAWG (directed acyclic word graph) is a trie in which identical subtrees
+# are shared, so that common suffixes ("-ing", "-ed", "'s", ...) are stored
+# only once
+#
+# the graph is held in flat arrays, indexed by node or edge number:
+#
+#   masks:       for each node, a bitmask of the lengths of the suffixes which
+#                lead from that node to the end of a word
+#                bit 0 is set on nodes which end a word, and bit 63 stands for
+#                all lengths of 63 or more
+#   edge_starts: for each node, the index of its first outgoing edge
+#                the edges of node `i` are `edge_starts[i]:edge_starts[i + 1]`
+#   labels:      for each edge, the codepoint of its character
+#                the edges of a node are sorted by label
+#   targets:     for each edge, the node which it leads to
+#
+# node 0 is the root
+#
+# DAWG file layout (all integers are little-endian):
+#
+#   header:      magic, node count, edge count, word count, length of the
+#                longest word (uint32s)
+#   arrays:      masks (uint64s), then edge_starts, labels, targets (uint32s)
+#
+# loading a file maps these arrays directly, without copying them, so
+# processes which load the same file share its memory
+_MAGIC = b"CMSDAWG\x02"
+_HEADER = struct.Struct("<8sIIII")
+_MAX_LENGTH_BIT = 63
+
+
+def _length_bits(min_length, max_length):
+    # the mask bits for a range of lengths
+    if max_length < 0 or max_length < min_length:
+        return 0
+    low = min(max(min_length, 0), _MAX_LENGTH_BIT)
+    high = min(max_length, _MAX_LENGTH_BIT)
+    return (1 << (high + 1)) - (1 << low)
+
+
+def _shift_mask(mask):
+    # the mask of a node's parent, as seen through the edge to the node
+    mask <<= 1
+    if mask >> _MAX_LENGTH_BIT:
+        mask = (mask & ((1 << _MAX_LENGTH_BIT) - 1)) | (1 << _MAX_LENGTH_BIT)
+    return mask
+
+
+def _build_graph(words):
+    # build a minimal DAWG incrementally from sorted, distinct words, returning
+    # it along with the number of words and the length of the longest word
+    # (Daciuk, Mihov, Watson & Watson, "Incremental Construction of Minimal
+    # Acyclic Finite-State Automata", 2000)
+    #
+    # the edges of each node are held in a dict while the node can still
+    # change, and as a tuple of (label, child) pairs once it is registered
+    finals = [False]
+    children = [{}]
+    register = {}
+    # the path of (parent, label, child) for the last word added, which has
+    # not yet been checked against the register of unique nodes
+    unchecked = []
+
+    def minimize(down_to):
+        while len(unchecked) > down_to:
+            parent, label, child = unchecked.pop()
+            key = (finals[child], tuple(children[child].items()))
+            if key in register:
+                children[parent][label] = register[key]
+                # the duplicate node is unreachable now, so drop its edges
+                children[child] = None
+            else:
+                register[key] = child
+                children[child] = key[1]
+
+    previous = ""
+    word_count = max_length = 0
+    for word in words:
+        common = 0
+        for a, b in zip(word, previous):
+            if a != b:
+                break
+            common += 1
+        minimize(common)
+
+        node = unchecked[-1][2] if unchecked else 0
+        for char in word[common:]:
+            child = len(finals)
+            finals.append(False)
+            children.append({})
+            children[node][ord(char)] = child
+            unchecked.append((node, ord(char), child))
+            node = child
+        finals[node] = True
+        previous = word
+        word_count += 1
+        max_length = max(max_length, len(word))
+    minimize(0)
+    children[0] = tuple(children[0].items())
+    return finals, children, word_count, max_length
+
+
+def _flatten_graph(finals, children):
+    # number the reachable nodes in reverse postorder, so that every node is
+    # numbered before all of its children
+    postorder = []
+    visited = {0}
+    stack = [(0, iter(children[0]))]
+    while stack:
+        node, unvisited = stack[-1]
+        for _, child in unvisited:
+            if child not in visited:
+                visited.add(child)
+                stack.append((child, iter(children[child])))
+                break
+        else:
+            stack.pop()
+            postorder.append(node)
+    order = postorder[::-1]
+    numbering = {node: i for i, node in enumerate(order)}
+
+    edge_starts = array.array("I")
+    labels = array.array("I")
+    targets = array.array("I")
+    for node in order:
+        edge_starts.append(len(labels))
+        for label, child in children[node]:
+            labels.append(label)
+            targets.append(numbering[child])
+    edge_starts.append(len(labels))
+
+    # computing masks in reverse order sees every child before its parents
+    masks = array.array("Q", bytes(8 * len(order)))
+    for i in range(len(order) - 1, -1, -1):
+        mask = 1 if finals[order[i]] else 0
+        for e in range(edge_starts[i], edge_starts[i + 1]):
+            mask |= _shift_mask(masks[targets[e]])
+        masks[i] = mask
+    return masks, edge_starts, labels, targets
+
+
+class DawgCorpus:
+    # a corpus backed by a DAWG
+    #
+    # this holds far less memory than a WordCorpus, at the cost of slower
+    # lookups and iteration, since every word is read out of the graph a
+    # character at a time
+
+    # as for WordCorpus
+    source_path = None
+
+    def __init__(self, masks, edge_starts, labels, targets, word_count, max_length):
+        self._masks = masks
+        self._edge_starts = edge_starts
+        self._labels = labels
+        self._targets = targets
+        self._word_count = word_count
+        self._max_length = max_length
+
+    @classmethod
+    def from_words(cls, words):
+        finals, children, word_count, max_length = _build_graph(sorted_unique(words))
+        return cls(*_flatten_graph(finals, children), word_count, max_length)
+
+    def _walk(self, prefix, node=0):
+        # the node reached by following `prefix` from `node`, or None
+        labels = self._labels
+        for char in prefix:
+            label = ord(char)
+            end = self._edge_starts[node + 1]
+            i = bisect.bisect_left(labels, label, self._edge_starts[node], end)
+            if i == end or labels[i] != label:
+                return None
+            node = self._targets[i]
+        return node
+
+    def lengths(self):
+        mask = self._masks[0] if self._masks else 0
+        lengths = [n for n in range(_MAX_LENGTH_BIT) if mask & (1 << n)]
+        # the masks don't distinguish between long lengths, so all of them up
+        # to the longest word are included
+        if mask >> _MAX_LENGTH_BIT:
+            lengths += range(_MAX_LENGTH_BIT, self._max_length + 1)
+        return lengths
+
+    def words_with_prefix(self, prefix, min_length=0, max_length=sys.maxsize):
+        # iterate over the words which start with `prefix` and have lengths in
+        # the given range, in sorted order
+        node = self._walk(prefix)
+        if node is None:
+            return
+        masks, edge_starts = self._masks, self._edge_starts
+        labels, targets = self._labels, self._targets
+
+        # for each depth, the mask bits for the lengths which a child node can
+        # have left for the word to end at an acceptable length
+        wanted = [
+            _length_bits(min_length - depth - 1, max_length - depth - 1)
+            for depth in range(min(max_length, _MAX_LENGTH_BIT) + 1)
+        ]
+        last_depth = len(wanted) - 1
+
+        stack = [(node, prefix)]
+        while stack:
+            node, word = stack.pop()
+            depth = len(word)
+            if depth >= min_length and masks[node] & 1:
+                yield word
+            # only follow edges to nodes which can complete a word of an
+            # acceptable length
+            if depth <= last_depth:
+                want = wanted[depth]
+            else:
+                want = _length_bits(min_length - depth - 1, max_length - depth - 1)
+            for i in range(edge_starts[node + 1] - 1, edge_starts[node] - 1, -1):
+                if masks[targets[i]] & want:
+                    stack.append((targets[i], word + chr(labels[i])))
+
+    def iter_words(self, min_length=0, max_length=sys.maxsize):
+        return self.words_with_prefix("", min_length, max_length)
+
+    def words_of_length(self, n):
+        return self.iter_words(n, n)
+
+    def iter_candidates(self, lengths, possessive_lengths, word=None):
+        # the non-possessive words with lengths in `lengths`, and the possessive
+        # words with lengths in `possessive_lengths`
+        lengths, possessive_lengths = frozenset(lengths), frozenset(possessive_lengths)
+        either = lengths | possessive_lengths
+        if not either:
+            return
+        for word in self.iter_words(min(either), max(either)):
+            if word.endswith(POSSESSIVE_SUFFIX):
+                if len(word) in possessive_lengths:
+                    yield word
+            elif len(word) in lengths:
+                yield word
+
+    def words_within(self, word, max_distances):
+        # iterate over the words whose edit distance from `word`, counting only
+        # insertions and deletions, is at most `max_distances[n]`, for words of
+        # each length n in the mapping
+        #
+        # this runs a Levenshtein automaton for `word` over the graph: each
+        # path from the root carries the row of distances between its prefix
+        # and each prefix of `word`, and a path is abandoned as soon as no
+        # entry of its row can lead to a word close enough
+        #
+        # a word which continues a prefix whose distance from the first j
+        # characters of `word` is row[j], with s more characters, is at least
+        # row[j] + |n - j - s| from `word`, since the rest of `word` has n - j
+        # characters
+        # the lengths of the words below each node are known from its mask,
+        # so this bound is applied with the shortest and longest of them, and
+        # the largest distance allowed for any of those lengths
+        #
+        # entries of a row are never less than the difference between j and
+        # the length of the prefix, so only a band of each row, where they
+        # could be within the largest distance, is computed, and the others
+        # are set to just over it
+        if not max_distances:
+            return
+        limit = max(max_distances.values())
+        min_length, max_length = min(max_distances), max(max_distances)
+        masks, edge_starts = self._masks, self._edge_starts
+        labels, targets = self._labels, self._targets
+        n = len(word)
+        over = limit + 1
+        # for each node depth and range of suffix lengths, what each entry of
+        # a row adds to the distance of the words below, less the largest
+        # distance allowed for any of them
+        penalties = {}
+
+        def penalty(depth, low, high):
+            # the top bit of a mask stands for every longer suffix too
+            if high == _MAX_LENGTH_BIT:
+                high = max(high, max_length - depth)
+            allowed = max(
+                max_distances.get(depth + s, -1) for s in range(low, high + 1)
+            )
+            return [max(low - (n - j), n - j - high, 0) - allowed for j in range(n + 1)]
+
+        stack = [(0, "", list(range(n + 1)))]
+        while stack:
+            node, prefix, row = stack.pop()
+            depth = len(prefix)
+            if masks[node] & 1 and row[n] <= max_distances.get(depth, -1):
+                yield prefix
+            # only follow edges to nodes which can complete a word of one of
+            # the lengths, and only compute the band of their rows which could
+            # be within the largest distance
+            want = _length_bits(min_length - depth - 1, max_length - depth - 1)
+            low, high = max(depth + 1 - limit, 1), min(depth + 1 + limit, n)
+            for i in range(edge_starts[node], edge_starts[node + 1]):
+                mask = masks[targets[i]] & want
+                if not mask:
+                    continue
+                char = chr(labels[i])
+                next_row = [over] * (n + 1)
+                d = over
+                if low == 1:
+                    d = next_row[0] = depth + 1
+                for j in range(low, high + 1):
+                    if word[j - 1] == char:
+                        d = row[j - 1]
+                    else:
+                        d = min(row[j], d) + 1
+                    next_row[j] = d
+
+                key = (
+                    depth + 1,
+                    (mask & -mask).bit_length() - 1,
+                    mask.bit_length() - 1,
+                )
+                bound = penalties.get(key)
+                if bound is None:
+                    bound = penalties[key] = penalty(*key)
+                if min(map(operator.add, next_row, bound)) <= 0:
+                    stack.append((targets[i], prefix + char, next_row))
+
+    def slice(self, min_length, max_length):
+        return CorpusSlice(self, min_length, max_length)
+
+    def union(self, other):
+        return CorpusUnion(self, other)
+
+    def contains_any_case(self, s):
+        return _contains_any_case(self, s)
+
+    def __contains__(self, word):
+        node = self._walk(word)
+        return node is not None and bool(self._masks[node] & 1)
+
+    def __iter__(self):
+        return self.iter_words()
+
+    def __len__(self):
+        return self._word_count
+
+
+def write_dawg_data(fp, words):
+    # words are sorted with spilling to disk, so that only the graph itself
+    # has to fit in memory
+    finals, children, word_count, max_length = _build_graph(sorted_unique(words))
+    masks, edge_starts, labels, targets = _flatten_graph(finals, children)
+    if sys.byteorder != "little":
+        for arr in (masks, edge_starts, labels, targets):
+            arr.byteswap()
+    fp.write(_HEADER.pack(_MAGIC, len(masks), len(labels), word_count, max_length))
+    for arr in (masks, edge_starts, labels, targets):
+        fp.write(arr.tobytes())
+
+
+def write_dawg(path, words):
+    with atomic_write_path(path) as tmp_path, open(tmp_path, "wb") as fp:
+        write_dawg_data(fp, words)
+
+
+def load_dawg(path):
+    with open(path, "rb") as fp:
+        data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        corpus = load_dawg_data(data)
+    except ValueError as err:
+        raise ValueError(f"{path}: {err}") from err
+    corpus.source_path = path
+    return corpus
+
+
+def load_dawg_data(data):
+    # a DAWG from the bytes of a DAWG file, which are used without copying
+    try:
+        header = _HEADER.unpack_from(data, 0)
+    except struct.error as err:
+        raise ValueError("not a DAWG file") from err
+    magic, node_count, edge_count, word_count, max_length = header
+    if magic != _MAGIC:
+        raise ValueError("not a DAWG file")
+    if len(data) != _HEADER.size + 12 * node_count + 4 + 8 * edge_count:
+        raise ValueError("truncated DAWG file")
+
+    view = memoryview(data)
+    arrays = []
+    offset = _HEADER.size
+    for typecode, count in (
+        ("Q", node_count),
+        ("I", node_count + 1),
+        ("I", edge_count),
+        ("I", edge_count),
+    ):
+        size = count * array.array(typecode).itemsize
+        arr = view[offset : offset + size].cast(typecode)
+        if sys.byteorder != "little":
+            arr = array.array(typecode, arr)
+            arr.byteswap()
+        arrays.append(arr)
+        offset += size
+    return DawgCorpus(*arrays, word_count, max_length)
@@ -0,0 +1,79 @@
+import heapq
+import tempfile
+
+# the most words held in memory at once while sorting
+# beyond this, sorted runs of words are spilled to temporary files and merged
+_RUN_SIZE = 250000
+
+
+class _Run:
+    # a sorted run of words spilled to a temporary file, as the words of each
+    # group in order of group
+    def __init__(self, buckets):
+        self.counts = {}
+        self.fp = tempfile.TemporaryFile("w+", encoding="utf-8", newline="\n")
+        for group in sorted(buckets):
+            self.counts[group] = len(buckets[group])
+            self.fp.write("\n".join(sorted(buckets[group])) + "\n")
+        self.fp.seek(0)
+
+    def read_group(self, group):
+        # groups must be read in order, since they are read straight from the
+        # file
+        for _ in range(self.counts.get(group, 0)):
+            yield self.fp.readline()[:-1]
+
+
+def _merge_unique(runs):
+    # the same word may appear in several runs, but merging them brings its
+    # copies together
+    previous = None
+    for word in heapq.merge(*runs):
+        if word != previous:
+            yield word
+        previous = word
+
+
+def sorted_groups(words, key, run_size=_RUN_SIZE):
+    # iterate over `(group, words)` pairs for the distinct words of an iterable,
+    # where words are grouped by `key(word)` (or all in one group, if `key` is
+    # None), and both the groups and the words within them are in sorted order,
+    # holding at most `run_size` words in memory
+    #
+    # like `itertools.groupby`, each group must be consumed before the next
+    # words must not contain newlines, since that is how spilled runs are
+    # separated
+    buckets = {}
+    size = 0
+    spilled = []
+    try:
+        for word in words:
+            group = key(word) if key else None
+            if group not in buckets:
+                buckets[group] = set()
+            bucket = buckets[group]
+            if word not in bucket:
+                bucket.add(word)
+                size += 1
+                if size >= run_size:
+                    spilled.append(_Run(buckets))
+                    buckets, size = {}, 0
+
+        groups = set(buckets).union(*(run.counts for run in spilled))
+        for group in sorted(groups):
+            in_memory = sorted(buckets.pop(group, ()))
+            if not spilled:
+                yield group, iter(in_memory)
+            else:
+                runs = [run.read_group(group) for run in spilled] + [in_memory]
+                yield group, _merge_unique(runs)
+    finally:
+        for run in spilled:
+            run.fp.close()
+
+
+def sorted_unique(words, run_size=_RUN_SIZE):
+    # iterate over the distinct words of an iterable in sorted order, holding
+    # at most `run_size` of them in memory
+    for _, group in sorted_groups(words, None, run_size):
+        yield from group
@@ -0,0 +1,49 @@
+from .base import Matcher
+from .common import could_match, fuzzy_candidates
+from .scan import ScanMatcher
+
+# the ways in which close matches for an unknown word are found
+#
+# every matcher implements the interface of `Matcher`: it is built from a
+# corpus (and the cache directory, or None), and `close_matches(word, cutoff)`
+# returns the best matches for a word, best first
+# 'difflib' is the reference, which scores every word that could match, and
+# other matchers are registered here under a name for `--matcher`
+# most find candidates in some index and leave the scoring to `Matcher`, so
+# they differ from the reference only in which words they leave out: some
+# leave out only words which can't match, and give exactly the same results,
+# while others may leave out some words which would have matched, in exchange
+# for scoring far fewer words
+MATCHER_NAMES = ("difflib", "symspell", "automaton", "ngram", "bitparallel")
+
+
+def get_matcher(name):
+    if name == "difflib":
+        return ScanMatcher
+    if name == "symspell":
+        from .symspell import SymSpellMatcher
+
+        return SymSpellMatcher
+    if name == "automaton":
+        from .automaton import AutomatonMatcher
+
+        return AutomatonMatcher
+    if name == "ngram":
+        from .ngram import NgramMatcher
+
+        return NgramMatcher
+    if name == "bitparallel":
+        from .bitparallel import BitParallelMatcher
+
+        return BitParallelMatcher
+    raise ValueError(f"unknown matcher: {name}")
+
+
+__all__ = (
+    "MATCHER_NAMES",
+    "Matcher",
+    "ScanMatcher",
+    "could_match",
+    "fuzzy_candidates",
+    "get_matcher",
+)
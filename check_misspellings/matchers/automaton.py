@@ -0,0 +1,34 @@
+from ..dawg import DawgCorpus, load_dawg_data, write_dawg_data
+from .base import Matcher
+from .common import cached_index, corpus_layers, could_match, layer_index, max_edits
+
+
+class AutomatonMatcher(Matcher):
+    # a matcher which walks a Levenshtein automaton for each unknown word over
+    # a DAWG of each layer of the corpus, abandoning every prefix which can't
+    # lead to a word within the edit distance allowed by the cutoff
+    #
+    # layers held by the 'dawg' backend are walked directly, and the others
+    # are compiled into DAWGs (cached like other corpora) when first needed
+    def __init__(self, corpus, cache_dir=None):
+        self.graphs = []
+        for layer in corpus_layers(corpus):
+            if not isinstance(layer, DawgCorpus):
+                layer = layer_index(layer, "dawg", self._compiler(layer, cache_dir))
+            self.graphs.append(layer)
+
+    @staticmethod
+    def _compiler(layer, cache_dir):
+        return lambda: cached_index(
+            "dawg", layer, cache_dir, write_dawg_data, load_dawg_data
+        )
+
+    def candidates(self, word, cutoff):
+        n = len(word)
+        for graph in self.graphs:
+            max_distances = {
+                m: max_edits(n, m, cutoff)
+                for m in graph.lengths()
+                if could_match(n, m, cutoff)
+            }
+            yield from graph.words_within(word, max_distances)
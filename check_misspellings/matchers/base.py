@@ -0,0 +1,22 @@
+class Matcher:
+    # the interface of matchers
+    #
+    # a matcher is built from a corpus and a cache directory (or None), with
+    # `Matcher(corpus, cache_dir)`, and may build or load any indexes it needs
+    # at that point or when they are first used
+    #
+    # `close_matches(word, cutoff)` returns the best matches for an unknown
+    # word, best first, among the words of the corpus whose difflib ratio with
+    # it is at least `cutoff`
+    # by default, this scores the words returned by `candidates(word, cutoff)`
+    # with difflib, so most matchers only need to find candidates, and differ
+    # from the reference 'difflib' matcher only in which words they leave out
+    def candidates(self, word, cutoff):
+        raise NotImplementedError
+
+    def close_matches(self, word, cutoff, n=3):
+        import difflib
+
+        return difflib.get_close_matches(
+            word, self.candidates(word, cutoff), n=n, cutoff=cutoff
+        )
@@ -0,0 +1,50 @@
+from .common import min_matches
+from .scan import ScanMatcher
+
+# a bit-parallel computation of the longest common subsequence of a word and
+# each candidate (Allison & Dix, 1986, in the form given by Hyyrö, 2004)
+#
+# the word's characters are positions in a bit vector, and each character of
+# a candidate updates the whole vector with a few integer operations, so
+# comparing a word with a candidate costs one step per character of the
+# candidate rather than one per pair of characters
+# python integers have no fixed width, so words of any length fit in one
+# vector, though most are short enough to fit in a machine word
+#
+# difflib's ratio is 2 * M / (n + m) where M counts the characters of some
+# common subsequence, so a candidate whose longest common subsequence is too
+# short for the cutoff can't be a close match, and only the others are scored
+
+
+def pattern_masks(word):
+    # for each character of `word`, the bits of the positions where it appears
+    masks = {}
+    for i, char in enumerate(word):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks
+
+
+def lcs_length(masks, n, candidate):
+    # the length of the longest common subsequence of a word of length n, with
+    # `pattern_masks` `masks`, and `candidate`
+    full = (1 << n) - 1
+    v = full
+    for char in candidate:
+        u = v & masks.get(char, 0)
+        v = ((v + u) | (v - u)) & full
+    return n - bin(v).count("1")
+
+
+class BitParallelMatcher(ScanMatcher):
+    # a matcher which offers the candidates of the 'difflib' matcher whose
+    # longest common subsequence with the word could give a close match
+    def candidates(self, word, cutoff):
+        n = len(word)
+        masks = pattern_masks(word)
+        thresholds = {}
+        for candidate in super().candidates(word, cutoff):
+            m = len(candidate)
+            if m not in thresholds:
+                thresholds[m] = min_matches(n, m, cutoff)
+            if lcs_length(masks, n, candidate) >= thresholds[m]:
+                yield candidate
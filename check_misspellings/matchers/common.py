@@ -0,0 +1,151 @@
+import io
+import math
+import mmap
+import zlib
+
+from ..cache import (
+    atomic_write_path,
+    load_or_write_cache_file,
+    matcher_index_cache_path,
+)
+from ..corpus import CorpusUnion
+
+# indexes of fewer words than this are built in memory for every run, rather
+# than cached
+_CACHE_MIN_WORDS = 20000
+
+
+def could_match(n, m, cutoff):
+    # whether words of lengths n and m can have a ratio of at least `cutoff`
+    # a ratio is never more than 2 * min(n, m) / (n + m)
+    return n + m > 0 and 2.0 * min(n, m) / (n + m) >= cutoff
+
+
+def max_edits(n, m, cutoff):
+    # the most edits (insertions, deletions, substitutions and transpositions)
+    # between words of lengths n and m with a ratio of at least `cutoff`
+    #
+    # a ratio is 2 * M / (n + m), where M counts the characters of a common
+    # subsequence, and two words with a common subsequence of M characters are
+    # within n + m - 2 * M edits (deleting the other characters of one and
+    # inserting those of the other)
+    return math.floor((n + m) * (1 - cutoff) + 1e-9)
+
+
+def min_matches(n, m, cutoff):
+    # the fewest matching characters for which words of lengths n and m have a
+    # ratio of at least `cutoff`, computed as difflib does, or None if there are
+    # none
+    for matches in range(min(n, m) + 1):
+        if 2.0 * matches / (n + m) >= cutoff:
+            return matches
+    return None
+
+
+def fuzzy_candidates(word, corpus, cutoff):
+    # the words of `corpus` which could be close matches for `word`
+    #
+    # a close match must have a ratio of at least `cutoff`, so words of
+    # lengths which can't reach it are never considered
+    # possessive words ending in "'s" have a tighter bound when `word` has no
+    # apostrophe, since the apostrophe can't be part of any matching block
+    n = len(word)
+    lengths = [m for m in corpus.lengths() if could_match(n, m, cutoff)]
+    if "'" in word:
+        possessive_lengths = lengths
+    else:
+        possessive_lengths = [
+            m for m in lengths if 2.0 * min(n, m - 1) / (n + m) >= cutoff
+        ]
+    return corpus.iter_candidates(lengths, possessive_lengths, word)
+
+
+def corpus_layers(corpus):
+    # the corpora which make up a corpus
+    # matchers index each layer separately, so that the indexes of layers
+    # which are shared (e.g. the builtin corpus, by overlays) are shared too
+    if isinstance(corpus, CorpusUnion):
+        for layer in corpus.corpora:
+            yield from corpus_layers(layer)
+    else:
+        yield corpus
+
+
+# the indexes built in this run, keyed by the id of the corpus layer which
+# they index and the name of the index
+_LAYER_INDEXES = {}
+
+
+def layer_index(layer, name, build):
+    # the index `name` of a corpus layer, built by calling `build` when it is
+    # first needed in this run
+    key = (id(layer), name)
+    if key not in _LAYER_INDEXES:
+        # the layer is kept with its index, so that its id is never reused
+        # while the index is
+        _LAYER_INDEXES[key] = (layer, build())
+    return _LAYER_INDEXES[key][1]
+
+
+def _words_digest(words):
+    # an order-independent digest of some words, and the number of words, for
+    # finding a cached index without depending on how the words were stored
+    count = total = xor = 0
+    for word in words:
+        h = zlib.crc32(word.encode("utf-8"))
+        count += 1
+        total += h
+        xor ^= h
+    return count, f"{count}:{total}:{xor}"
+
+
+def cached_index(name, words, cache_dir, write, load, min_words=_CACHE_MIN_WORDS):
+    # an index of `words` (e.g. a corpus layer), which is written as bytes with
+    # `write(fp, sorted_words)` and read back with `load(data)`
+    #
+    # indexes are cached in `cache_dir` (unless it is None), and cached indexes
+    # are mapped rather than read
+    # corpora loaded from a file are keyed by the file, so that their indexes
+    # are found without reading any words, and other words are keyed by a
+    # digest of them
+    # indexes of fewer than `min_words` words which aren't loaded from a file
+    # are always built in memory
+
+    # external_sort imports tempfile, which is slow to import, so it is only
+    # imported when an index is built
+    from ..external_sort import sorted_unique
+
+    path = None
+    if cache_dir:
+        source_path = getattr(words, "source_path", None)
+        try:
+            if source_path:
+                path = matcher_index_cache_path(
+                    cache_dir, name, source_path=source_path
+                )
+        except OSError:
+            pass
+        if path is None:
+            count, digest = _words_digest(words)
+            if count >= min_words:
+                path = matcher_index_cache_path(cache_dir, name, digest=digest)
+    if path is None:
+        fp = io.BytesIO()
+        write(fp, sorted_unique(words))
+        return load(fp.getvalue())
+
+    def write_index(path):
+        with atomic_write_path(path) as tmp_path, open(tmp_path, "wb") as fp:
+            write(fp, sorted_unique(words))
+
+    try:
+        return load_or_write_cache_file(
+            path, lambda path: _map_index(path, load), write_index
+        )
+    except (OSError, ValueError):
+        return cached_index(name, words, None, write, load, min_words)
+
+
+def _map_index(path, load):
+    with open(path, "rb") as fp:
+        return load(mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ))
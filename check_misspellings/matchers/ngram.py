@@ -0,0 +1,213 @@
+import array
+import bisect
+import collections
+import itertools
+import struct
+import sys
+import zlib
+
+from .base import Matcher
+from .common import cached_index, corpus_layers, could_match, layer_index, min_matches
+
+# an inverted index of the character n-grams (trigrams, and bigrams for short
+# words) of each layer of the corpus, which finds the words sharing enough
+# n-grams with a word to possibly be a close match
+#
+# words are padded with q - 1 newlines at either end, so that a word of length
+# n has n + q - 1 q-grams
+# two words with a common subsequence of M characters are related by deleting
+# the other n - M characters of one and inserting m - M characters, and each
+# deletion breaks at most q of the first word's q-grams and each insertion at
+# most q - 1, so the q-grams which they share (counted with repeats) are at
+# least
+#
+#   n + q - 1 - q * (n - M) - (q - 1) * (m - M)
+#
+# difflib's ratio is 2 * M / (n + m) for some common subsequence, so the
+# fewest M which reaches the cutoff gives the fewest q-grams which a close
+# match of each length can share with the word
+# trigrams are used where this is above zero, and bigrams otherwise, and where
+# neither gives a bound every word of that length is a candidate
+#
+# candidates are then scored with difflib as usual, so this gives exactly the
+# same matches as the 'difflib' matcher
+#
+# repeated n-grams are indexed once for each repeat, as the n-gram and its
+# repeat number, so that shared n-grams are counted as difflib would count
+# shared characters
+#
+# index layout (all integers are little-endian):
+#
+#   header:         magic, word count, length count, key count, posting count
+#                   (uint32s)
+#   word_offsets:   for each word, the offset of its end in the words data
+#                   (uint32s)
+#   lengths:        each word length, in increasing order (uint32s)
+#   length_starts:  for each length, the number of its first word, followed by
+#                   the word count (uint32s)
+#   keys:           the CRC-32 of each distinct n-gram and repeat number, in
+#                   sorted order (uint32s)
+#   key_starts:     for each key, the index of its first posting, followed by
+#                   the posting count (uint32s)
+#   postings:       for each key, the numbers of the words containing it, in
+#                   increasing order (uint32s)
+#   words:          the words, sorted by length and then by word, encoded as
+#                   UTF-8
+#
+# keys are looked up by hash, so a hash collision only adds candidates
+_MAGIC = b"CMSNGRM\x01"
+_HEADER = struct.Struct("<8sIIII")
+_GRAM_SIZES = (3, 2)
+
+
+def _keys(word, q):
+    # the hashes of the q-grams of `word`, each with its repeat number
+    padded = "\n" * (q - 1) + word + "\n" * (q - 1)
+    seen = collections.Counter()
+    for i in range(len(padded) - q + 1):
+        gram = padded[i : i + q]
+        seen[gram] += 1
+        yield zlib.crc32(f"{seen[gram]}:{gram}".encode("utf-8"))
+
+
+def min_shared(n, m, cutoff, q):
+    # the fewest q-grams which a word of length n shares with a word of length
+    # m whose ratio with it is at least `cutoff`
+    matches = min_matches(n, m, cutoff)
+    if matches is None:
+        return None
+    return n + q - 1 - q * (n - matches) - (q - 1) * (m - matches)
+
+
+def write_index(fp, words):
+    # index distinct words, writing the index to a binary file object
+    words = sorted(words, key=len)
+    word_offsets = array.array("I")
+    lengths = array.array("I")
+    length_starts = array.array("I")
+    entries = array.array("Q")
+    data = bytearray()
+    for i, word in enumerate(words):
+        data += word.encode("utf-8")
+        word_offsets.append(len(data))
+        if not lengths or lengths[-1] != len(word):
+            lengths.append(len(word))
+            length_starts.append(i)
+        for q in _GRAM_SIZES:
+            entries.extend((key << 32) | i for key in set(_keys(word, q)))
+    length_starts.append(len(words))
+
+    keys = array.array("I")
+    key_starts = array.array("I")
+    postings = array.array("I")
+    for key, group in itertools.groupby(sorted(entries), key=lambda e: e >> 32):
+        keys.append(key)
+        key_starts.append(len(postings))
+        postings.extend(e & 0xFFFFFFFF for e in group)
+    key_starts.append(len(postings))
+
+    fp.write(_HEADER.pack(_MAGIC, len(words), len(lengths), len(keys), len(postings)))
+    for arr in (word_offsets, lengths, length_starts, keys, key_starts, postings):
+        if sys.byteorder != "little":
+            arr.byteswap()
+        fp.write(arr.tobytes())
+    fp.write(data)
+
+
+class NgramIndex:
+    def __init__(self, data):
+        try:
+            header = _HEADER.unpack_from(data, 0)
+        except struct.error as err:
+            raise ValueError("not an n-gram index") from err
+        magic, word_count, length_count, key_count, posting_count = header
+        if magic != _MAGIC:
+            raise ValueError("not an n-gram index")
+
+        view = memoryview(data)
+        arrays = []
+        offset = _HEADER.size
+        for count in (
+            word_count,
+            length_count,
+            length_count + 1,
+            key_count,
+            key_count + 1,
+            posting_count,
+        ):
+            size = count * array.array("I").itemsize
+            if offset + size > len(data):
+                raise ValueError("truncated n-gram index")
+            arr = view[offset : offset + size].cast("I")
+            if sys.byteorder != "little":
+                arr = array.array("I", arr)
+                arr.byteswap()
+            arrays.append(arr)
+            offset += size
+        (
+            self._word_offsets,
+            self._lengths,
+            self._length_starts,
+            self._keys,
+            self._key_starts,
+            self._postings,
+        ) = arrays
+        self._words = view[offset:]
+
+    def _word(self, i):
+        start = self._word_offsets[i - 1] if i else 0
+        return str(self._words[start : self._word_offsets[i]], "utf-8")
+
+    def _shared_counts(self, word, q, start, end):
+        # the number of q-grams which `word` shares with each of the words
+        # numbered from `start` to `end`, for the words which share any
+        keys, key_starts, postings = self._keys, self._key_starts, self._postings
+        counts = collections.Counter()
+        for key in _keys(word, q):
+            k = bisect.bisect_left(keys, key)
+            if k == len(keys) or keys[k] != key:
+                continue
+            lo, hi = key_starts[k], key_starts[k + 1]
+            lo = bisect.bisect_left(postings, start, lo, hi)
+            hi = bisect.bisect_left(postings, end, lo, hi)
+            counts.update(postings[lo:hi])
+        return counts
+
+    def candidates(self, word, cutoff):
+        # the words of the index which share enough n-grams with `word` to
+        # have a ratio of at least `cutoff` with it (and some others, on hash
+        # collisions)
+        n = len(word)
+        for k, m in enumerate(self._lengths):
+            if not could_match(n, m, cutoff):
+                continue
+            start, end = self._length_starts[k], self._length_starts[k + 1]
+            for q in _GRAM_SIZES:
+                need = min_shared(n, m, cutoff, q)
+                if need > 0:
+                    counts = self._shared_counts(word, q, start, end)
+                    ids = sorted(i for i, c in counts.items() if c >= need)
+                    break
+            else:
+                ids = range(start, end)
+            for i in ids:
+                yield self._word(i)
+
+
+class NgramMatcher(Matcher):
+    # a matcher which uses an n-gram index of each layer of the corpus
+    def __init__(self, corpus, cache_dir=None):
+        self.indexes = [
+            layer_index(
+                layer,
+                "ngram",
+                lambda: cached_index(
+                    "ngram", layer, cache_dir, write_index, NgramIndex
+                ),
+            )
+            for layer in corpus_layers(corpus)
+        ]
+
+    def candidates(self, word, cutoff):
+        for index in self.indexes:
+            yield from index.candidates(word, cutoff)
@@ -0,0 +1,85 @@
+import math
+
+from .common import min_matches
+
+# a filter of the words of one length by difflib's quick_ratio, which is an
+# upper bound on their ratio with a word
+#
+# quick_ratio counts the characters which two words have in common, regardless
+# of order: the sum over each character of the smaller of its counts in either
+# word
+# for each character c and count t, the words with at least t copies of c are
+# stored as the bits of an integer, so the number of characters which each word
+# has in common with a word is the sum of the integers for each (c, t) in that
+# word
+# these sums are computed for every word at once, as a binary counter spread
+# over integers (one for each bit of the count), so the work per word is done
+# by integer operations rather than python loops
+#
+# the words which pass are exactly those for which difflib's quick_ratio is at
+# least the cutoff, so scoring only these gives exactly the same matches
+
+
+def _set_bits(x):
+    # the positions of the set bits of a non-negative integer
+    while x:
+        low = x & -x
+        yield low.bit_length() - 1
+        x ^= low
+
+
+class QuickRatioFilter:
+    def __init__(self, words):
+        self.words = list(words)
+        self.length = len(self.words[0]) if self.words else 0
+        size = math.ceil(len(self.words) / 8)
+        rows = {}
+        for i, word in enumerate(self.words):
+            byte, bit = i >> 3, 1 << (i & 7)
+            seen = {}
+            for char in word:
+                t = seen[char] = seen.get(char, 0) + 1
+                row = rows.get((char, t))
+                if row is None:
+                    row = rows[(char, t)] = bytearray(size)
+                row[byte] |= bit
+        self._masks = {key: int.from_bytes(row, "little") for key, row in rows.items()}
+
+    def _counts(self, word):
+        # the number of characters which each word has in common with `word`,
+        # as a list of integers holding each bit of the counts, lowest first
+        planes = []
+        seen = {}
+        for char in word:
+            t = seen[char] = seen.get(char, 0) + 1
+            x = self._masks.get((char, t))
+            # add x to the counter, carrying into the higher bits
+            for k in range(len(planes)):
+                if not x:
+                    break
+                planes[k], x = planes[k] ^ x, planes[k] & x
+            if x:
+                planes.append(x)
+        return planes
+
+    def candidates(self, word, cutoff):
+        # the words whose quick_ratio with `word` is at least `cutoff`
+        threshold = min_matches(len(word), self.length, cutoff)
+        if threshold is None or not self.words:
+            return
+        planes = self._counts(word)
+        if threshold >> len(planes):
+            return
+
+        # compare the counts with the threshold, from the highest bit down:
+        # `above` holds the words whose counts are already known to be larger,
+        # and `equal` those whose bits have all matched the threshold so far
+        above, equal = 0, (1 << len(self.words)) - 1
+        for k in reversed(range(len(planes))):
+            if threshold >> k & 1:
+                equal &= planes[k]
+            else:
+                above |= equal & planes[k]
+                equal &= ~planes[k]
+        for i in _set_bits(above | equal):
+            yield self.words[i]
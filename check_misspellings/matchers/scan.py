@@ -0,0 +1,35 @@
+from .base import Matcher
+from .common import corpus_layers, could_match, fuzzy_candidates, layer_index
+from .quick_ratio import QuickRatioFilter
+
+
+class ScanMatcher(Matcher):
+    # the reference matcher, which offers every word of the corpus whose
+    # ratio with the word could be at least the cutoff
+    #
+    # the words of each length of each layer are filtered by difflib's
+    # quick_ratio all at once (see QuickRatioFilter), rather than one at a time
+    # by difflib, which leaves exactly the words that difflib would go on to
+    # score
+    # layers which choose their own candidates (the 'sqlite' backend) are
+    # asked for them as usual
+    def __init__(self, corpus, cache_dir=None):
+        self.layers = list(corpus_layers(corpus))
+
+    def candidates(self, word, cutoff):
+        n = len(word)
+        for layer in self.layers:
+            if getattr(layer, "chooses_candidates", False):
+                yield from fuzzy_candidates(word, layer, cutoff)
+                continue
+            for m in layer.lengths():
+                if could_match(n, m, cutoff):
+                    yield from self._filter(layer, m).candidates(word, cutoff)
+
+    @staticmethod
+    def _filter(layer, m):
+        return layer_index(
+            layer,
+            f"quick-ratio-{m}",
+            lambda: QuickRatioFilter(layer.words_of_length(m)),
+        )
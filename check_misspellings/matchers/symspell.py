@@ -0,0 +1,166 @@
+import array
+import bisect
+import io
+import itertools
+import struct
+import sys
+import zlib
+
+from .base import Matcher
+from .common import cached_index, corpus_layers, could_match, layer_index
+
+# a symmetric delete index (as in SymSpell), which finds the words of a corpus
+# within a small edit distance of a word without comparing it to every word
+#
+# every string formed by deleting up to MAX_DISTANCE characters from the
+# prefix of a corpus word is indexed
+# two words are within MAX_DISTANCE edits of each other (counting
+# insertions, deletions and substitutions) only if some string can be formed
+# by deleting up to MAX_DISTANCE characters from each of them, so the
+# candidates for a word are found by looking up its own deletions
+# only the first PREFIX_LENGTH characters are used, which keeps the number of
+# deletions per word small, and words which share a prefix share its entries
+#
+# candidates are then scored with difflib as usual, so cutoffs are applied
+# exactly as they are for other matchers
+# matching is approximate: a close match by difflib's ratio which differs by
+# more than MAX_DISTANCE edits in its prefix is never a candidate
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+
+# index layout (all integers are little-endian):
+#
+#   header:         magic, word count, prefix count, entry count (uint32s)
+#   word_offsets:   for each word, the offset of its end in the words data,
+#                   so word `i` is `words[word_offsets[i - 1]:word_offsets[i]]`
+#                   (uint32s)
+#   prefix_starts:  for each distinct prefix, the number of the first word
+#                   with that prefix, followed by the word count (uint32s)
+#   entries:        for each deletion of each prefix, the CRC-32 of the
+#                   deletion in the high 32 bits and the prefix number in the
+#                   low 32 bits, in sorted order (uint64s)
+#   words:          the sorted words of the corpus, encoded as UTF-8
+#
+# entries are looked up by hash, so a hash collision only adds candidates
+_MAGIC = b"CMSSYMS\x01"
+_HEADER = struct.Struct("<8sIII")
+
+
+def _deletions(s):
+    # the strings formed by deleting up to MAX_DISTANCE characters from `s`
+    found = {s}
+    edge = found
+    for _ in range(MAX_DISTANCE):
+        edge = {t[:i] + t[i + 1 :] for t in edge for i in range(len(t))}
+        found |= edge
+    return found
+
+
+def _hash(s):
+    return zlib.crc32(s.encode("utf-8"))
+
+
+def write_index(fp, words):
+    # index sorted, distinct words, writing the index to a binary file object
+    # entries are bucketed by their top byte as they are made, so that sorting
+    # them never needs more than one bucket of python ints at a time
+    word_offsets = array.array("I")
+    prefix_starts = array.array("I")
+    buckets = [array.array("Q") for _ in range(256)]
+    data = io.BytesIO()
+    previous = None
+    for i, word in enumerate(words):
+        data.write(word.encode("utf-8"))
+        word_offsets.append(data.tell())
+        prefix = word[:PREFIX_LENGTH]
+        if prefix == previous:
+            continue
+        previous = prefix
+        prefix_number = len(prefix_starts)
+        prefix_starts.append(i)
+        for deletion in _deletions(prefix):
+            h = _hash(deletion)
+            buckets[h >> 24].append((h << 32) | prefix_number)
+    prefix_starts.append(len(word_offsets))
+
+    entry_count = sum(map(len, buckets))
+    fp.write(
+        _HEADER.pack(_MAGIC, len(word_offsets), len(prefix_starts) - 1, entry_count)
+    )
+    sorted_buckets = (array.array("Q", sorted(bucket)) for bucket in buckets)
+    for arr in itertools.chain([word_offsets, prefix_starts], sorted_buckets):
+        if sys.byteorder != "little":
+            arr.byteswap()
+        fp.write(arr.tobytes())
+    fp.write(data.getbuffer())
+
+
+class SymSpellIndex:
+    def __init__(self, data):
+        try:
+            magic, word_count, prefix_count, entry_count = _HEADER.unpack_from(data, 0)
+        except struct.error as err:
+            raise ValueError("not a symspell index") from err
+        if magic != _MAGIC:
+            raise ValueError("not a symspell index")
+
+        view = memoryview(data)
+        arrays = []
+        offset = _HEADER.size
+        for typecode, count in (
+            ("I", word_count),
+            ("I", prefix_count + 1),
+            ("Q", entry_count),
+        ):
+            size = count * array.array(typecode).itemsize
+            if offset + size > len(data):
+                raise ValueError("truncated symspell index")
+            arr = view[offset : offset + size].cast(typecode)
+            if sys.byteorder != "little":
+                arr = array.array(typecode, arr)
+                arr.byteswap()
+            arrays.append(arr)
+            offset += size
+        self._word_offsets, self._prefix_starts, self._entries = arrays
+        self._words = view[offset:]
+
+    def _word(self, i):
+        start = self._word_offsets[i - 1] if i else 0
+        return str(self._words[start : self._word_offsets[i]], "utf-8")
+
+    def candidates(self, word):
+        # the words of the index whose prefixes are within MAX_DISTANCE edits of
+        # the prefix of `word` (and some others, on hash collisions)
+        entries = self._entries
+        prefixes = set()
+        for deletion in _deletions(word[:PREFIX_LENGTH]):
+            h = _hash(deletion)
+            lo = bisect.bisect_left(entries, h << 32)
+            hi = bisect.bisect_left(entries, (h + 1) << 32, lo)
+            prefixes.update(entries[i] & 0xFFFFFFFF for i in range(lo, hi))
+        for prefix in prefixes:
+            start, end = self._prefix_starts[prefix], self._prefix_starts[prefix + 1]
+            for i in range(start, end):
+                yield self._word(i)
+
+
+class SymSpellMatcher(Matcher):
+    # a matcher which uses a symmetric delete index of each layer of the corpus
+    def __init__(self, corpus, cache_dir=None):
+        self.indexes = [
+            layer_index(
+                layer,
+                "symspell",
+                lambda: cached_index(
+                    "symspell", layer, cache_dir, write_index, SymSpellIndex
+                ),
+            )
+            for layer in corpus_layers(corpus)
+        ]
+
+    def candidates(self, word, cutoff):
+        n = len(word)
+        for index in self.indexes:
+            for candidate in index.candidates(word):
+                if could_match(n, len(candidate), cutoff):
+                    yield candidate
@@ -0,0 +1,234 @@
+import os
+import pathlib
+import sqlite3
+import sys
+
+from .cache import atomic_write_path
+from .corpus import POSSESSIVE_SUFFIX, CorpusSlice, CorpusUnion, _contains_any_case
+from .external_sort import sorted_unique
+
+# a corpus stored in an SQLite database, for corpora which are too large to
+# hold in memory in every process which checks files
+#
+#   words:     each word, numbered in sorted order, with its length and whether
+#              it is possessive
+#   trigrams:  for each trigram of each word, the trigram, the length of the
+#              word, and the word's number
+#              words are padded with a newline at either end, so that a word
+#              of length n has n trigrams, and short words still have some
+#
+# exact lookups use the unique index on words, and fuzzy candidates are the
+# words which share the most trigrams with the word being matched, found with
+# the primary key of trigrams
+#
+# databases are written once and never modified, so they are opened read-only
+# and immutable, and any number of processes can share one without locking
+#
+# the database format is stored as the user_version, so that databases written
+# by older versions are not read
+_FORMAT = 1
+# the most fuzzy candidates returned for a word by each corpus
+# candidates are ranked by the number of trigrams they share with the word, so
+# beyond this the words are unlikely to be close matches
+_TRIGRAM_CANDIDATES = 200
+# the number of rows inserted at once when building a database
+_BATCH_SIZE = 10000
+
+_SCHEMA = """
+CREATE TABLE words (
+    id INTEGER PRIMARY KEY,
+    word TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    possessive INTEGER NOT NULL
+);
+CREATE TABLE trigrams (
+    gram TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    id INTEGER NOT NULL,
+    PRIMARY KEY (gram, length, id)
+) WITHOUT ROWID;
+"""
+# indexes are created after the words are inserted, which is much faster than
+# updating them with every insert
+_INDEXES = """
+CREATE UNIQUE INDEX words_by_word ON words (word);
+CREATE INDEX words_by_length ON words (length);
+"""
+
+
+def _trigrams(word):
+    padded = f"\n{word}\n"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _placeholders(values):
+    return ", ".join("?" * len(values))
+
+
+def _populate(conn, words):
+    # fill a new database with the words of an iterable, in sorted order so
+    # that word numbers follow the order of the words
+    conn.executescript(_SCHEMA)
+    word_rows, gram_rows = [], []
+
+    def flush():
+        conn.executemany("INSERT INTO words VALUES (?, ?, ?, ?)", word_rows)
+        conn.executemany("INSERT INTO trigrams VALUES (?, ?, ?)", gram_rows)
+        word_rows.clear()
+        gram_rows.clear()
+
+    for i, word in enumerate(sorted_unique(words)):
+        n = len(word)
+        word_rows.append((i, word, n, word.endswith(POSSESSIVE_SUFFIX)))
+        gram_rows.extend((gram, n, i) for gram in _trigrams(word))
+        if len(word_rows) >= _BATCH_SIZE:
+            flush()
+    flush()
+    conn.executescript(_INDEXES)
+    conn.execute(f"PRAGMA user_version = {_FORMAT}")
+    conn.commit()
+
+
+class SqliteCorpus:
+    # a corpus backed by an SQLite database
+    #
+    # this holds almost nothing in memory, at the cost of a query for every
+    # lookup
+    # fuzzy candidates are limited to the words most like the word being
+    # matched, so matching is approximate: a close match which shares few
+    # trigrams with the word can be missed when many other words share more
+
+    # matchers ask for fuzzy candidates with `iter_candidates`, rather than
+    # scanning the words of the corpus
+    chooses_candidates = True
+    # the database file, which matchers' cached indexes are keyed by
+    source_path = None
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._lengths = None
+        self._word_count = None
+
+    @classmethod
+    def from_words(cls, words):
+        conn = sqlite3.connect(":memory:")
+        _populate(conn, words)
+        return cls(conn)
+
+    def _words(self, query, params=()):
+        return (word for (word,) in self._conn.execute(query, params))
+
+    def lengths(self):
+        if self._lengths is None:
+            self._lengths = [
+                n
+                for (n,) in self._conn.execute(
+                    "SELECT DISTINCT length FROM words ORDER BY length"
+                )
+            ]
+        return self._lengths
+
+    def iter_words(self, min_length=0, max_length=sys.maxsize):
+        return self._words(
+            "SELECT word FROM words WHERE length BETWEEN ? AND ?",
+            (min_length, max_length),
+        )
+
+    def words_of_length(self, n):
+        return self.iter_words(n, n)
+
+    def iter_candidates(self, lengths, possessive_lengths, word=None):
+        # the non-possessive words with lengths in `lengths`, and the possessive
+        # words with lengths in `possessive_lengths`
+        # if `word` is given, only the words which share the most trigrams
+        # with it are returned
+        lengths, possessive_lengths = list(lengths), list(possessive_lengths)
+        either = sorted(set(lengths) | set(possessive_lengths))
+        if not either:
+            return iter(())
+        which = (
+            f"(length IN ({_placeholders(lengths)}) AND NOT possessive) OR "
+            f"(length IN ({_placeholders(possessive_lengths)}) AND possessive)"
+        )
+        if word is None:
+            return self._words(
+                f"SELECT word FROM words WHERE {which}", lengths + possessive_lengths
+            )
+
+        grams = sorted(_trigrams(word))
+        query = (
+            "SELECT word FROM ("
+            "  SELECT id, count(*) AS shared FROM trigrams"
+            f"  WHERE gram IN ({_placeholders(grams)})"
+            f"  AND length IN ({_placeholders(either)})"
+            "  GROUP BY id"
+            f") JOIN words USING (id) WHERE {which} "
+            "ORDER BY shared DESC, id LIMIT ?"
+        )
+        params = grams + either + lengths + possessive_lengths + [_TRIGRAM_CANDIDATES]
+        return self._words(query, params)
+
+    def slice(self, min_length, max_length):
+        return CorpusSlice(self, min_length, max_length)
+
+    def union(self, other):
+        return CorpusUnion(self, other)
+
+    def contains_any_case(self, s):
+        return _contains_any_case(self, s)
+
+    def __contains__(self, word):
+        row = self._conn.execute("SELECT 1 FROM words WHERE word = ?", (word,))
+        return row.fetchone() is not None
+
+    def __iter__(self):
+        return self.iter_words()
+
+    def __len__(self):
+        if self._word_count is None:
+            (self._word_count,) = self._conn.execute(
+                "SELECT count(*) FROM words"
+            ).fetchone()
+        return self._word_count
+
+
+def write_sqlite_corpus(path, words):
+    try:
+        with atomic_write_path(path) as tmp_path:
+            # a database left by a run which was killed while writing it would
+            # be added to rather than replaced
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            conn = sqlite3.connect(tmp_path)
+            try:
+                # a database which fails to build is never moved into place, so
+                # there is no need for a journal
+                conn.execute("PRAGMA journal_mode = OFF")
+                conn.execute("PRAGMA synchronous = OFF")
+                _populate(conn, words)
+            finally:
+                conn.close()
+    except sqlite3.Error as err:
+        # sqlite reports a database which can't be written (an unwritable
+        # directory, or a full disk) as its own error, which callers treat
+        # like any other failure to write a file
+        raise OSError(f"could not write {path}: {err}") from err
+
+
+def load_sqlite_corpus(path):
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    # immutable databases are read without any locking, which is safe because
+    # they are only ever replaced, never modified
+    uri = pathlib.Path(path).absolute().as_uri()
+    try:
+        conn = sqlite3.connect(f"{uri}?mode=ro&immutable=1", uri=True)
+        (version,) = conn.execute("PRAGMA user_version").fetchone()
+    except sqlite3.Error as err:
+        raise ValueError(f"{path} is not a corpus database") from err
+    if version != _FORMAT:
+        conn.close()
+        raise ValueError(f"{path} is not a corpus database")
+    corpus = SqliteCorpus(conn)
+    corpus.source_path = path
+    return corpus
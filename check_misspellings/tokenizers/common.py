@@ -1,5 +1,5 @@
 import re
-import uuid
+
 _URI_RE_S = r"https?\:\/\/\w+\.\w+(\.\w+)*\/[^\s]*"
 
 HAS_URI_SCHEME_REGEX = re.compile(r"^https?\:\/\/")
@@ -13,6 +13,19 @@ DISABLE_COMMENT_REGEX = re.compile(r"check\-misspellings\s*:\s*off")
 ENABLE_COMMENT_REGEX = re.compile(r"check\-misspellings\s*:\s*on")
 
 
+def _is_uuid(tok):
+    # the same check which `uuid.UUID(tok)` makes, without importing `uuid`,
+    # which is slow to import
+    digits = tok.replace("urn:", "").replace("uuid:", "").strip("{}").replace("-", "")
+    if len(digits) != 32:
+        return False
+    try:
+        int(digits, 16)
+    except ValueError:
+        return False
+    return True
+
+
 def should_skip_token(tok, context):
     if tok == "":
         return True
@@ -25,11 +38,8 @@ def should_skip_token(tok, context):
         return True
     except ValueError:
         pass
-    try:
-        uuid.UUID(tok)
+    if _is_uuid(tok):
         return True
-    except ValueError:
-        pass
 
     if HEX_COLOR_REGEX.fullmatch(tok):
         return True
@@ -0,0 +1,135 @@
+import ast
+import json
+import os
+
+from .cache import atomic_write_path
+
+# bump this whenever the names harvested from a file change, or the layout of
+# the vocabulary file changes, so that vocabularies written by older versions
+# are rebuilt
+_VOCABULARY_FORMAT = 2
+
+
+def harvest_names(filename):
+    # the names which a python file defines or imports, along with the name of
+    # the module itself
+    names = {os.path.splitext(os.path.basename(filename))[0]}
+    try:
+        with open(filename, "rb") as fp:
+            tree = ast.parse(fp.read(), filename)
+    except (SyntaxError, ValueError, OSError):
+        return names
+
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            if isinstance(node, ast.ImportFrom) and node.module:
+                names.update(node.module.split("."))
+            for alias in node.names:
+                names.update(alias.name.split("."))
+                if alias.asname:
+                    names.add(alias.asname)
+    names.discard("*")
+    return names
+
+
+def _file_state(filename):
+    st = os.stat(filename)
+    return [st.st_mtime_ns, st.st_size]
+
+
+class ProjectVocabulary:
+    # the names defined in the python files of a project, and which of them
+    # had no close match in the corpus when they were last checked
+    #
+    # fuzzy matching is the most expensive step of checking a word, and a
+    # project's own identifiers are checked in every run, but almost never
+    # match anything, so a name with no close match is remembered and not
+    # matched again in the file which defines it
+    # names with a close match are never remembered, so a misspelled
+    # definition is still reported
+    #
+    # verdicts only hold for the corpus they were found with, which is
+    # identified by `key` (or None, for a corpus which can't be identified),
+    # and are forgotten when it changes
+    #
+    # the names of each file are kept, along with the file's mtime and size,
+    # in a JSON file at `path` (if given), so that a file is only parsed again
+    # when it changes
+    # only the names of files which are part of the current run are used
+    def __init__(self, path=None, key=None):
+        self.path = path
+        self.key = key
+        self._files = {}
+        self._run_files = set()
+        self._no_match = set()
+        self._changed = False
+        if path:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as fp:
+                data = json.load(fp)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("format") != _VOCABULARY_FORMAT:
+            return
+        for filename, (state, names) in data.get("files", {}).items():
+            # forget files which have been deleted since the last run
+            if os.path.exists(filename):
+                self._files[filename] = (state, names)
+            else:
+                self._changed = True
+        if self.key is not None and data.get("key") == self.key:
+            self._no_match = set(data.get("no_match", ()))
+        elif data.get("no_match"):
+            self._changed = True
+
+    def update(self, filename):
+        # harvest the names of a file which is part of this run, unless it is
+        # unchanged since they were last harvested
+        filename = os.path.abspath(filename)
+        try:
+            state = _file_state(filename)
+        except OSError:
+            return
+        self._run_files.add(filename)
+        if filename in self._files and self._files[filename][0] == state:
+            return
+        self._files[filename] = (state, sorted(harvest_names(filename)))
+        self._changed = True
+
+    def names_of(self, filename):
+        # the names defined by a file of this run
+        filename = os.path.abspath(filename)
+        if filename not in self._run_files:
+            return frozenset()
+        return frozenset(self._files[filename][1])
+
+    def had_no_match(self, name):
+        return self.key is not None and name in self._no_match
+
+    def record_no_match(self, name):
+        if self.key is not None and name not in self._no_match:
+            self._no_match.add(name)
+            self._changed = True
+
+    def save(self):
+        if not (self.path and self._changed):
+            return
+        # verdicts are only kept for names which some file still defines
+        names = set()
+        for _, file_names in self._files.values():
+            names.update(file_names)
+        data = {
+            "format": _VOCABULARY_FORMAT,
+            "files": self._files,
+            "key": self.key,
+            "no_match": sorted(self._no_match & names),
+        }
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with atomic_write_path(self.path) as tmp_path, open(tmp_path, "w") as fp:
+            json.dump(data, fp)
+        self._changed = False
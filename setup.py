@@ -1,3 +1,25 @@
+import os
+import sys
+
 from setuptools import setup
+from setuptools.command.build_py import build_py
+
+
+class BuildPyWithCorpus(build_py):
+    # compile the builtin corpus as part of the build, so that installed copies
+    # of the package load it from a file rather than importing the (very large)
+    # python wordlist modules
+    def run(self):
+        super().run()
+        if self.dry_run:
+            return
+
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from check_misspellings.corpus import write_builtin_corpus
+
+        target = os.path.join(self.build_lib, "check_misspellings", "builtin_corpus")
+        self.announce(f"compiling builtin corpus in {target}", level=2)
+        write_builtin_corpus(target)
+
 
-setup()
+setup(cmdclass={"build_py": BuildPyWithCorpus})
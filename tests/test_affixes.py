@@ -0,0 +1,107 @@
+import hashlib
+
+import pytest
+
+from check_misspellings import AFFIX_HEADER, _read_corpus_files
+from check_misspellings.affixes import (
+    SUFFIX_RULES,
+    apply_rule,
+    compress_words,
+    expand_entries,
+    expand_entry,
+)
+
+# the SHA-256 of the SCOWL list, one word per line in sorted order, as it was
+# stored before it was affix-compressed
+SCOWL_DIGEST = "a7821a64a7a9d0a6a8fc28aefcb508c8a7bc502efbf54849a71c4516ff760595"
+
+WORDS = [
+    "anonymize",
+    "anonymized",
+    "anonymizing",
+    "anonymizes",
+    "apply",
+    "applies",
+    "applied",
+    "applying",
+    "city",
+    "cities",
+    "city's",
+    "cat",
+    "cats",
+    "cat's",
+    "cats's",
+    "kind",
+    "kindness",
+    "kindly",
+    "kindest",
+    "s",
+    "es",
+    "ing",
+    "Zürich",
+    "Zürich's",
+]
+
+
+def test_expand_entry():
+    assert expand_entry("anonymize/dgS") == [
+        "anonymize",
+        "anonymized",
+        "anonymizing",
+        "anonymizes",
+    ]
+    assert expand_entry("city/IM") == ["city", "cities", "city's"]
+    assert expand_entry("plain") == ["plain"]
+
+
+def test_every_rule_round_trips():
+    for flag, (strip, add) in SUFFIX_RULES.items():
+        stem = "ratify" if strip == "y" else "rate" if strip == "e" else "rat"
+        word = apply_rule(stem, flag)
+        assert expand_entries(compress_words([stem, word])) == [stem, word]
+
+
+def test_compress_round_trip():
+    entries = compress_words(WORDS)
+    expanded = expand_entries(entries)
+    assert len(expanded) == len(set(expanded))
+    assert set(expanded) == set(WORDS)
+    assert compress_words(expanded) == entries
+
+
+def test_invalid_entries():
+    with pytest.raises(ValueError):
+        apply_rule("cat", "?")
+    with pytest.raises(ValueError):
+        apply_rule("cat", "I")
+    with pytest.raises(ValueError):
+        compress_words(["TCP/IP"])
+
+
+def test_scowl_entries_give_the_flat_list():
+    from check_misspellings.builtin_corpus.scowl_wordlist import (
+        SCOWL_CORPUS,
+        SCOWL_ENTRIES,
+    )
+
+    assert len(SCOWL_CORPUS) == len(set(SCOWL_CORPUS))
+    assert compress_words(SCOWL_CORPUS) == SCOWL_ENTRIES
+    digest = hashlib.sha256("\n".join(sorted(SCOWL_CORPUS)).encode("utf-8"))
+    assert digest.hexdigest() == SCOWL_DIGEST
+
+
+def test_corpus_files_only_expand_entries_after_the_header(tmp_path):
+    plain = tmp_path / "plain.txt"
+    plain.write_text("TCP/IP\ncity/IM\n")
+    affixed = tmp_path / "affixed.txt"
+    affixed.write_text(f"TCP/IP\n{AFFIX_HEADER}\ncity/IM\nTCP/IP\nn/a\n")
+
+    assert list(_read_corpus_files([str(plain)])) == ["TCP/IP", "city/IM"]
+    assert list(_read_corpus_files([str(affixed)])) == [
+        "TCP/IP",
+        "city",
+        "cities",
+        "city's",
+        "TCP/IP",
+        "n/a",
+    ]
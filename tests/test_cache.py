@@ -0,0 +1,130 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from check_misspellings.cache import (
+    _STALE_TMP_SECONDS,
+    atomic_write_path,
+    corpus_cache_path,
+    load_or_write_cache_file,
+    prune_cache,
+)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_atomic_write_path(tmp_path):
+    path = str(tmp_path / "corpus-key.bin")
+    with atomic_write_path(path) as tmp_name, open(tmp_name, "w") as fp:
+        assert not os.path.exists(path)
+        fp.write("words")
+    assert os.listdir(tmp_path) == ["corpus-key.bin"]
+
+    # a failed write leaves neither the temporary file nor a new file
+    with pytest.raises(RuntimeError):
+        with atomic_write_path(path) as tmp_name, open(tmp_name, "w") as fp:
+            fp.write("partial")
+            raise RuntimeError
+    assert os.listdir(tmp_path) == ["corpus-key.bin"]
+    with open(path) as fp:
+        assert fp.read() == "words"
+
+
+def test_load_or_write_cache_file(tmp_path):
+    path = str(tmp_path / "cache" / "corpus-key.bin")
+    writes = []
+
+    def write(path):
+        writes.append(path)
+        with open(path, "w") as fp:
+            fp.write("words")
+
+    def load(path):
+        with open(path) as fp:
+            data = fp.read()
+        if data != "words":
+            raise ValueError(path)
+        return data
+
+    assert load_or_write_cache_file(path, load, write) == "words"
+    assert load_or_write_cache_file(path, load, write) == "words"
+    assert writes == [path]
+
+    # unreadable files are rebuilt
+    with open(path, "w") as fp:
+        fp.write("garbage")
+    assert load_or_write_cache_file(path, load, write) == "words"
+    assert writes == [path, path]
+
+
+def test_prune_cache(tmp_path):
+    def make(name, age):
+        path = tmp_path / name
+        path.write_text("")
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        return name
+
+    old = [make(f"corpus-{i}.bin", 100 + i) for i in range(4)]
+    other_kinds = [make("corpus-9.dawg", 1000), make("ngram-0.idx", 1000)]
+    stale_tmp = make("ngram-1.idx.123.tmp", _STALE_TMP_SECONDS + 60)
+    fresh_tmp = make("ngram-2.idx.456.tmp", 0)
+    new = make("corpus-new.bin", 0)
+
+    prune_cache(str(tmp_path / new), keep=3)
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        [new, fresh_tmp] + old[:2] + other_kinds
+    )
+    assert stale_tmp not in os.listdir(tmp_path)
+
+
+def test_corpus_cache_path_changes_with_contents(tmp_path):
+    corpus_file = tmp_path / "corpus.txt"
+    corpus_file.write_text("frobnicate\n")
+    path = corpus_cache_path(str(tmp_path), [str(corpus_file)], True, ".bin")
+    assert path == corpus_cache_path(str(tmp_path), [str(corpus_file)], True, ".bin")
+    assert path != corpus_cache_path(str(tmp_path), [str(corpus_file)], False, ".bin")
+    corpus_file.write_text("frobnicate\nfrobnicator\n")
+    assert path != corpus_cache_path(str(tmp_path), [str(corpus_file)], True, ".bin")
+
+
+def _check(tmp_path, *args):
+    return subprocess.run(
+        [sys.executable, "-c", "from check_misspellings import main; main()"]
+        + ["--cache-dir", str(tmp_path / "cache")]
+        + list(args),
+        cwd=REPO_ROOT,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+
+def test_compiled_corpus_is_reused(tmp_path):
+    corpus_file = tmp_path / "corpus.txt"
+    corpus_file.write_text("frobnicate\n")
+    checked = tmp_path / "checked.txt"
+    checked.write_text("frobnicate frobnicatte\n")
+    cache_dir = tmp_path / "cache"
+
+    def corpus_files():
+        return {
+            entry.name: entry.inode()
+            for entry in os.scandir(cache_dir)
+            if entry.name.startswith("corpus-")
+        }
+
+    args = ["--corpus", str(corpus_file), str(checked)]
+    first = _check(tmp_path, *args)
+    assert "frobnicatte" in first.stdout
+    compiled = corpus_files()
+    assert len(compiled) == 1
+    assert _check(tmp_path, *args).stdout == first.stdout
+    assert corpus_files() == compiled
+
+    # a changed corpus file is compiled again
+    corpus_file.write_text("frobnicate\nfrobnicatte\n")
+    assert "frobnicatte" not in _check(tmp_path, *args).stdout
+    assert len(corpus_files()) == 2
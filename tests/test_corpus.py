@@ -0,0 +1,167 @@
+import random
+
+import pytest
+
+from check_misspellings.corpus import (
+    CORPUS_BACKEND_NAMES,
+    WordCorpus,
+    _title,
+    get_corpus_backend,
+)
+
+WORDS = [
+    "a",
+    "I",
+    "an",
+    "cat",
+    "cat's",
+    "cats",
+    "Cat",
+    "iPhone",
+    "NASA",
+    "NASA's",
+    "McDonald's",
+    "O'Brien",
+    "another's",
+    "Zürich",
+    "straße",
+    "ǅemal",
+    "naïve",
+    "e-mail",
+    "configuration",
+    "internationalization",
+    "internationalization's",
+    "a" * 70,
+]
+
+PROBES = WORDS + [
+    "",
+    "A",
+    "CAT",
+    "CAT'S",
+    "Cat's",
+    "cAt",
+    "iphone",
+    "IPHONE",
+    "Iphone",
+    "nasa",
+    "Nasa",
+    "nasa's",
+    "mcdonald's",
+    "Mcdonald's",
+    "o'brien",
+    "O'brien",
+    "Another's",
+    "ANOTHER'S",
+    "zürich",
+    "ZÜRICH",
+    "Straße",
+    "STRASSE",
+    "ǆemal",
+    "Ǆemal",
+    "Naïve",
+    "E-mail",
+    "Configuration",
+    "configuratio",
+    "s",
+    "'s",
+    "A" * 70,
+    "dog",
+]
+
+
+def _contains_any_case(words, s):
+    # the three lookups which corpora used to make for every word
+    return s in words or s.lower() in words or _title(s) in words
+
+
+def _random_words(count, seed):
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        word = "".join(rng.choice("abcdeéAB'") for _ in range(rng.randint(1, 9)))
+        words.add(word)
+        if rng.random() < 0.2:
+            words.add(word + "'s")
+    return sorted(words)
+
+
+def _corpora(words, tmp_path):
+    # a corpus of `words` in each backend, both built in memory and written to
+    # and loaded from a file
+    for name in CORPUS_BACKEND_NAMES:
+        backend = get_corpus_backend(name)
+        yield f"{name} in memory", backend.from_words(words)
+        path = str(tmp_path / f"corpus-{name}{backend.suffix}")
+        backend.write(path, words)
+        yield f"{name} file", backend.load(path)
+
+
+@pytest.mark.parametrize("words", [WORDS, _random_words(2000, 0)])
+def test_backends_hold_the_same_words(words, tmp_path):
+    expected = set(words)
+    probes = set(PROBES) | {w + "x" for w in words} | {w[:-1] for w in words}
+    for name, corpus in _corpora(words, tmp_path):
+        assert len(corpus) == len(expected), name
+        assert sorted(corpus) == sorted(expected), name
+        # lengths may include some with no words (the DAWG backend doesn't
+        # distinguish between long lengths)
+        assert set(corpus.lengths()) >= {len(w) for w in expected}, name
+        for n in corpus.lengths():
+            assert sorted(corpus.words_of_length(n)) == sorted(
+                w for w in expected if len(w) == n
+            ), name
+        for probe in probes:
+            assert (probe in corpus) == (probe in expected), (name, probe)
+
+
+@pytest.mark.parametrize("words", [WORDS, _random_words(2000, 1)])
+def test_contains_any_case_matches_three_lookups(words, tmp_path):
+    expected = set(words)
+    probes = set(PROBES) | {w.upper() for w in words} | {_title(w) for w in words}
+    for name, corpus in _corpora(words, tmp_path):
+        for probe in probes:
+            assert corpus.contains_any_case(probe) == _contains_any_case(
+                expected, probe
+            ), (name, probe)
+
+
+def test_slices_and_unions_contain_any_case(tmp_path):
+    half = len(WORDS) // 2
+    first, second = set(WORDS[:half]), set(WORDS[half:]) - set(WORDS[:half])
+    expected = first | second
+    union = WordCorpus.from_words(first).union(WordCorpus.from_words(second))
+    for probe in PROBES:
+        assert union.contains_any_case(probe) == _contains_any_case(expected, probe)
+        in_slice = {w for w in expected if 3 <= len(w) <= 6}
+        assert union.slice(3, 6).contains_any_case(probe) == (
+            3 <= len(probe) <= 6 and _contains_any_case(in_slice, probe)
+        ), probe
+
+
+def test_sqlite_candidates_share_trigrams():
+    from check_misspellings.sqlite import _TRIGRAM_CANDIDATES, SqliteCorpus
+
+    words = _random_words(5000, 2) + ["configuration", "configuration's"]
+    corpus = SqliteCorpus.from_words(words)
+    lengths = range(10, 16)
+    candidates = list(corpus.iter_candidates(lengths, lengths, "configuraton"))
+    assert "configuration" in candidates
+    assert "configuration's" in candidates
+    assert len(candidates) <= _TRIGRAM_CANDIDATES
+    assert sorted(corpus.iter_candidates(lengths, ())) == sorted(
+        w for w in words if len(w) in lengths and not w.endswith("'s")
+    )
+
+
+def test_sqlite_errors(tmp_path):
+    backend = get_corpus_backend("sqlite")
+    not_a_database = tmp_path / "corpus.sqlite3"
+    not_a_database.write_text("configuration\n")
+    with pytest.raises(ValueError):
+        backend.load(str(not_a_database))
+    with pytest.raises(FileNotFoundError):
+        backend.load(str(tmp_path / "missing.sqlite3"))
+    with pytest.raises(OSError):
+        backend.write(str(tmp_path / "missing" / "corpus.sqlite3"), WORDS)
+    assert list(tmp_path.iterdir()) == [not_a_database]
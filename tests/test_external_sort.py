@@ -0,0 +1,37 @@
+import itertools
+import random
+
+import pytest
+
+from check_misspellings.external_sort import sorted_groups, sorted_unique
+
+
+def _words(count, seed):
+    # words with plenty of repeats, so that runs share words
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice("abcé'") for _ in range(rng.randint(1, 6)))
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("run_size", [1, 2, 7, 100, 100000])
+def test_sorted_groups(run_size):
+    words = _words(500, run_size)
+    expected = [
+        (n, sorted(group))
+        for n, group in itertools.groupby(sorted(set(words), key=len), key=len)
+    ]
+    groups = [(n, list(group)) for n, group in sorted_groups(words, len, run_size)]
+    assert groups == expected
+
+
+@pytest.mark.parametrize("run_size", [1, 5, 100000])
+def test_sorted_unique(run_size):
+    words = _words(1000, 0)
+    assert list(sorted_unique(iter(words), run_size)) == sorted(set(words))
+
+
+def test_sorted_groups_of_nothing():
+    assert list(sorted_groups([], len, 3)) == []
+    assert list(sorted_unique([], 3)) == []
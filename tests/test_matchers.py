@@ -0,0 +1,139 @@
+import difflib
+import itertools
+import random
+
+import pytest
+
+from check_misspellings import close_matches, get_cutoff_for_token
+from check_misspellings.corpus import (
+    WordCorpus,
+    get_corpus_backend,
+    load_builtin_corpus,
+    load_frequency_tiers,
+)
+from check_misspellings.matchers import get_matcher
+from check_misspellings.matchers.common import cached_index, corpus_layers
+from check_misspellings.matchers.ngram import NgramIndex, write_index
+from check_misspellings.matchers.quick_ratio import QuickRatioFilter
+
+# the matchers which must find exactly the same matches as difflib
+EXACT_MATCHERS = ("difflib", "automaton", "ngram", "bitparallel")
+
+
+def _typo(rng, word):
+    chars = list(word)
+    for _ in range(rng.randint(1, 3)):
+        i = rng.randrange(len(chars) + 1)
+        op = rng.randrange(4)
+        if op == 0 and i < len(chars):
+            del chars[i]
+        elif op == 1:
+            chars.insert(i, rng.choice("aeinrst'"))
+        elif op == 2 and i < len(chars):
+            chars[i] = rng.choice("aeinrst")
+        elif i + 1 < len(chars):
+            chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    return "".join(chars) or word
+
+
+@pytest.fixture(scope="module")
+def words():
+    from check_misspellings.builtin_corpus.scowl_wordlist import SCOWL_CORPUS
+
+    rng = random.Random(0)
+    # a few very long words, beyond the lengths which DAWG masks distinguish
+    long_words = ["".join(rng.choice("abc") for _ in range(70)) for _ in range(5)]
+    return rng.sample(SCOWL_CORPUS, 10000) + long_words
+
+
+@pytest.fixture(scope="module")
+def typos(words):
+    rng = random.Random(1)
+    return [_typo(rng, word) for word in rng.sample(words, 100)] + [
+        "configuraton",
+        "internationalizaton",
+        "incomprehensibilites",
+        "x",
+    ]
+
+
+@pytest.fixture(scope="module")
+def expected(words, typos):
+    # the matches of each typo, found by scoring every word with difflib
+    return {
+        typo: difflib.get_close_matches(typo, words, cutoff=get_cutoff_for_token(typo))
+        for typo in typos
+    }
+
+
+def test_quick_ratio_filter(words, typos):
+    # the filter passes exactly the words whose quick_ratio is at least the
+    # cutoff
+    for m in (1, 5, 9, 70):
+        of_length = [w for w in words if len(w) == m]
+        quick_ratio_filter = QuickRatioFilter(of_length)
+        for typo in typos:
+            cutoff = get_cutoff_for_token(typo)
+            assert list(quick_ratio_filter.candidates(typo, cutoff)) == [
+                w
+                for w in of_length
+                if difflib.SequenceMatcher(None, typo, w).quick_ratio() >= cutoff
+            ], (typo, m)
+
+
+@pytest.mark.parametrize("name", EXACT_MATCHERS)
+def test_exact_matchers_agree_with_difflib(name, words, expected):
+    matcher = get_matcher(name)(WordCorpus.from_words(words))
+    for typo, matches in expected.items():
+        assert matcher.close_matches(typo, get_cutoff_for_token(typo)) == matches, typo
+
+
+@pytest.mark.parametrize("name", EXACT_MATCHERS)
+def test_exact_matchers_over_several_layers(name, words, expected):
+    half = len(words) // 2
+    corpus = WordCorpus.from_words(words[:half]).union(
+        WordCorpus.from_words(words[half:])
+    )
+    matcher = get_matcher(name)(corpus)
+    for typo, matches in itertools.islice(expected.items(), 50):
+        assert matcher.close_matches(typo, get_cutoff_for_token(typo)) == matches, typo
+
+
+def test_indexes_of_file_layers_are_found_without_reading_words(words, tmp_path):
+    backend = get_corpus_backend("sets")
+    path = str(tmp_path / "corpus.bin")
+    backend.write(path, words)
+    added = WordCorpus.from_words(["frobnicate"])
+    assert list(corpus_layers(backend.load(path).union(added)))[1] is added
+
+    cache_dir = str(tmp_path / "cache")
+    index = cached_index(
+        "ngram", backend.load(path), cache_dir, write_index, NgramIndex
+    )
+    assert index.candidates("configuraton", 0.8)
+    layer = backend.load(path)
+    index = cached_index("ngram", layer, cache_dir, write_index, NgramIndex)
+    assert layer._groups == {}
+    assert list(index.candidates("configuraton", 0.8)) == list(
+        cached_index("ngram", words, None, write_index, NgramIndex).candidates(
+            "configuraton", 0.8
+        )
+    )
+
+
+def test_tiers_find_matches_exactly_when_an_exhaustive_search_does(typos):
+    # with an exact matcher, searching tiers of common words first changes at
+    # most which matches are suggested, never whether a word has any
+    corpus = load_builtin_corpus()
+    tiers = load_frequency_tiers()
+    matcher = get_matcher("difflib")(corpus)
+    rng = random.Random(2)
+    common_typos = [
+        _typo(rng, word) for tier in tiers for word in rng.sample(list(tier), 20)
+    ]
+    for typo in typos + common_typos:
+        cutoff = get_cutoff_for_token(typo)
+        exhaustive = matcher.close_matches(typo, cutoff)
+        tiered = close_matches(typo, matcher, cutoff, tiers)
+        assert bool(tiered) == bool(exhaustive), typo
+        assert all(word in corpus for word in tiered), typo
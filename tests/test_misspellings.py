@@ -0,0 +1,78 @@
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+from check_misspellings import parse_misspellings
+from check_misspellings.corpus import load_builtin_categories, load_builtin_corpus
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _check(*args):
+    return subprocess.run(
+        [sys.executable, "-c", "from check_misspellings import main; main()"]
+        + ["--no-cache"]
+        + list(args),
+        cwd=REPO_ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+
+def test_parse_misspellings(tmp_path):
+    path = tmp_path / "misspellings.txt"
+    path.write_text("# comment\n\nconfiguraton->configuration\nteh -> the, tea\n")
+    table = parse_misspellings([str(path)])
+    assert table["configuraton"] == ["configuration"]
+    assert table["teh"] == ["the", "tea"]
+    assert table["recieve"] == ["receive"]
+
+
+@pytest.mark.parametrize("line", ["configuraton", "->configuration", "configuraton->"])
+def test_parse_misspellings_errors(tmp_path, line):
+    path = tmp_path / "misspellings.txt"
+    path.write_text(f"teh->the\n{line}\n")
+    with pytest.raises(ValueError, match=re.escape(f"{path}:2:")):
+        parse_misspellings([str(path)])
+
+
+def test_builtin_table_matches_the_corpus():
+    from check_misspellings.builtin_corpus import CATEGORIES
+    from check_misspellings.builtin_corpus.known_misspellings import (
+        KNOWN_MISSPELLINGS,
+    )
+
+    corpus = load_builtin_corpus(ascii_ize=False)
+    corpus = corpus.union(load_builtin_categories(CATEGORIES, corpus, ascii_ize=False))
+    for typo, correction in KNOWN_MISSPELLINGS.items():
+        assert not corpus.contains_any_case(typo), typo
+        for word in correction.split():
+            assert corpus.contains_any_case(word), (typo, correction)
+
+
+def test_bad_misspellings_files_are_usage_errors(tmp_path):
+    checked = tmp_path / "checked.txt"
+    checked.write_text("configuraton\n")
+    bad = tmp_path / "misspellings.txt"
+    bad.write_text("configuraton configuration\n")
+
+    for path in (bad, tmp_path / "missing.txt"):
+        result = _check("--misspellings", str(path), str(checked))
+        assert result.returncode == 2
+        assert "--misspellings" in result.stderr
+        assert str(path) in result.stderr
+        assert result.stdout == ""
+
+
+def test_misspellings_files_are_reported_with_their_corrections(tmp_path):
+    checked = tmp_path / "checked.txt"
+    checked.write_text("frobnicatte\n")
+    misspellings = tmp_path / "misspellings.txt"
+    misspellings.write_text("frobnicatte->frobnicate\n")
+    result = _check("--misspellings", str(misspellings), str(checked))
+    assert result.returncode == 1
+    assert "'frobnicatte' appears similar to frobnicate" in result.stdout
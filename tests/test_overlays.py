@@ -0,0 +1,111 @@
+import os
+import subprocess
+import sys
+
+from check_misspellings import (
+    OVERLAY_FILENAME,
+    _Context,
+    _Overlays,
+    check_tokenstream,
+    lengthmapped_corpus,
+)
+from check_misspellings.corpus import WordCorpus
+from check_misspellings.tokenizers import TOKENIZER_MAPPING
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _make_tree(tmp_path):
+    # project/.check-misspellings-corpus
+    # project/sub/.check-misspellings-corpus
+    # project/other/
+    # outside/.check-misspellings-corpus
+    project = tmp_path / "project"
+    for directory in (project / "sub", project / "other", tmp_path / "outside"):
+        directory.mkdir(parents=True)
+    (project / OVERLAY_FILENAME).write_text("configuraton\n")
+    (project / "sub" / OVERLAY_FILENAME).write_text("internationalizaton\n")
+    (tmp_path / "outside" / OVERLAY_FILENAME).write_text("internationalizaton\n")
+    (tmp_path / OVERLAY_FILENAME).write_text("internationalizaton\n")
+    return project
+
+
+def test_overlay_chains(tmp_path, monkeypatch):
+    project = _make_tree(tmp_path)
+    monkeypatch.chdir(project)
+    overlays = _Overlays(None, OVERLAY_FILENAME)
+
+    def chain(*parts):
+        return overlays._chain(os.path.abspath(os.path.join(*parts)))
+
+    root_overlay = os.path.join(os.getcwd(), OVERLAY_FILENAME)
+    assert chain(".") == (root_overlay,)
+    assert chain("other") == (root_overlay,)
+    assert chain("sub") == (
+        root_overlay,
+        os.path.join(os.getcwd(), "sub", OVERLAY_FILENAME),
+    )
+    # overlays outside the current directory, including those above it, never
+    # apply
+    assert chain("..", "outside") == ()
+    assert overlays._chain(os.path.dirname(os.getcwd())) == ()
+
+
+def test_overlays_add_words_below_them(tmp_path):
+    project = _make_tree(tmp_path)
+    checked = []
+    for directory in (project / "sub", project / "other", tmp_path / "outside"):
+        path = directory / "checked.txt"
+        path.write_text("configuraton internationalizaton\n")
+        checked.append(str(path))
+
+    result = subprocess.run(
+        [sys.executable, "-c", "from check_misspellings import main; main()"]
+        + ["--no-cache"]
+        + checked,
+        cwd=str(project),
+        env=dict(os.environ, PYTHONPATH=REPO_ROOT),
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    # each file with errors is named on a line of its own, followed by its
+    # errors
+    reported = set()
+    for line in result.stdout.splitlines():
+        if "checked.txt" in line:
+            directory = os.path.basename(os.path.dirname(line.split("checked.txt")[0]))
+        for word in ("configuraton", "internationalizaton"):
+            if f"'{word}' appears similar" in line:
+                reported.add((directory, word))
+    assert reported == {
+        ("other", "internationalizaton"),
+        ("outside", "configuraton"),
+        ("outside", "internationalizaton"),
+    }
+
+
+def test_base_results_are_kept_in_the_context(tmp_path):
+    # library callers check files against a length map of their own corpus,
+    # and read the results from the context
+    path = tmp_path / "checked.txt"
+    path.write_text("configuration configuraton frobnicate\n")
+    context = _Context()
+    context.exhaustive_matching = True
+    lengthmap = lengthmapped_corpus(WordCorpus.from_words(["configuration"]))
+    tokenizer = dict(TOKENIZER_MAPPING)["text"]
+    check_tokenstream(str(path), tokenizer, context, lengthmap)
+
+    assert context.cached_matches_in_corpus == {"configuration"}
+    assert context.non_error_non_corpus_words == {"frobnicate"}
+    assert context.found_error_matches == {"configuraton": ["configuration"]}
+    assert context.found_error_locations == {
+        str(path): [
+            (
+                "configuraton",
+                "configuration configuraton frobnicate",
+                14,
+                1,
+                ["configuration"],
+            )
+        ]
+    }
@@ -0,0 +1,49 @@
+import ast
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules which are slow to import, and which runs that never check a word
+# (e.g. runs on excluded files) must not import
+SLOW_MODULES = (
+    "ast",
+    "difflib",
+    "hashlib",
+    "json",
+    "random",
+    "sqlite3",
+    "tempfile",
+    "check_misspellings.builtin_corpus.scowl_wordlist",
+    "check_misspellings.builtin_corpus.software_terms",
+    "check_misspellings.dawg",
+    "check_misspellings.external_sort",
+    "check_misspellings.sqlite",
+    "check_misspellings.vocabulary",
+)
+
+_SCRIPT = """
+import sys
+sys.argv = ["check-misspellings", "--exclude", {path!r}, {path!r}]
+from check_misspellings import main
+try:
+    main()
+except SystemExit:
+    pass
+print(sorted(sys.modules))
+"""
+
+
+def test_excluded_run_imports_no_slow_modules(tmp_path):
+    path = tmp_path / "excluded.txt"
+    path.write_text("some words\n")
+    result = subprocess.run(
+        [sys.executable, "-c", _SCRIPT.format(path=str(path))],
+        cwd=REPO_ROOT,
+        stdout=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    )
+    modules = set(ast.literal_eval(result.stdout.splitlines()[-1]))
+    assert sorted(modules.intersection(SLOW_MODULES)) == []
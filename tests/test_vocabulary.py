@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+
+from check_misspellings.vocabulary import ProjectVocabulary, harvest_names
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SOURCE = """\
+import os.path
+from collections import OrderedDict as odict
+
+
+class Frobnicator:
+    def proccess(self):
+        pass
+
+
+async def quuxify():
+    pass
+"""
+
+
+def test_harvest_names(tmp_path):
+    path = tmp_path / "frobnicate.py"
+    path.write_text(SOURCE)
+    assert harvest_names(str(path)) == {
+        "frobnicate",
+        "os",
+        "path",
+        "collections",
+        "OrderedDict",
+        "odict",
+        "Frobnicator",
+        "proccess",
+        "quuxify",
+    }
+    path.write_text("def broken(:\n")
+    assert harvest_names(str(path)) == {"frobnicate"}
+
+
+def test_verdicts_are_kept_for_the_same_corpus(tmp_path):
+    source = tmp_path / "frobnicate.py"
+    source.write_text(SOURCE)
+    path = str(tmp_path / "vocabulary.json")
+
+    vocabulary = ProjectVocabulary(path, "key")
+    vocabulary.update(str(source))
+    assert "quuxify" in vocabulary.names_of(str(source))
+    assert vocabulary.names_of(str(tmp_path / "other.py")) == frozenset()
+    vocabulary.record_no_match("quuxify")
+    vocabulary.record_no_match("unused")
+    vocabulary.save()
+
+    vocabulary = ProjectVocabulary(path, "key")
+    assert vocabulary.had_no_match("quuxify")
+    # verdicts are only kept for names which some file defines
+    assert not vocabulary.had_no_match("unused")
+    # and are forgotten when the corpus changes, or can't be identified
+    assert not ProjectVocabulary(path, "other key").had_no_match("quuxify")
+    assert not ProjectVocabulary(path, None).had_no_match("quuxify")
+
+
+def _check(tmp_path, *args):
+    return subprocess.run(
+        [sys.executable, "-c", "from check_misspellings import main; main()"]
+        + ["-v", "--cache-dir", str(tmp_path / "cache"), "--project-vocabulary"]
+        + list(args),
+        cwd=str(tmp_path),
+        env=dict(os.environ, PYTHONPATH=REPO_ROOT),
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+
+def test_names_without_matches_are_not_matched_again(tmp_path):
+    source = tmp_path / "frobnicate.py"
+    source.write_text(SOURCE)
+
+    for run in range(2):
+        result = _check(tmp_path, str(source))
+        # a misspelled definition is reported in every run
+        assert "'proccess' appears similar to process" in result.stdout
+        assert "'odict' appears similar to dict" in result.stdout
+        # while names without a close match ('quuxify', but not 'odict' or
+        # 'Frobnicator') are only matched in the first
+        hits = 0 if run == 0 else 1
+        assert f"{hits} avoided by the project vocabulary" in result.stdout, run
+
+    # an edit to a corpus file changes the corpus, which forgets the verdicts
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text("frobnicator\n")
+    result = _check(tmp_path, "--corpus", str(corpus), str(source))
+    assert "0 avoided by the project vocabulary" in result.stdout